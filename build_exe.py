@@ -8,8 +8,8 @@ from cx_Freeze import setup, Executable
 
 # Dependencies are automatically detected, but it might need fine tuning
 build_options = {
-    'packages': ['tkinter'],
-    'excludes': ['matplotlib', 'numpy', 'PIL'],
+    'packages': ['tkinter', 'numpy'],
+    'excludes': ['matplotlib', 'PIL'],
     'include_files': []
 }
 
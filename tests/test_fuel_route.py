@@ -0,0 +1,59 @@
+"""Fuel-tank routes against a brute-force (station, tank) Dijkstra on the built-in map"""
+
+import heapq
+import math
+import random
+
+import numpy as np
+
+from tradewinds_adventure import WORLD
+from tradewinds_routes import RoutePlanner
+
+
+def fuel_units(travel_time: float) -> int:
+    return max(1, math.ceil(travel_time * 1.25))
+
+
+def brute_force_cost(world, origin: str, destination: str, capacity: int, fuel: int, prices) -> float:
+    """Cheapest talents to arrive, buying one unit at a time"""
+    start, goal = world.location_index[origin], world.location_index[destination]
+    best = {(start, min(fuel, capacity)): 0.0}
+    heap = [(0.0, start, min(fuel, capacity))]
+    while heap:
+        cost, row, tank = heapq.heappop(heap)
+        if row == goal:
+            return cost
+        if cost > best[(row, tank)]:
+            continue
+        moves = [(row, tank + 1, cost + prices[row])] if tank < capacity else []
+        for target, travel_time in world.adjacency[row].items():
+            burn = fuel_units(travel_time)
+            if burn <= tank:
+                moves.append((target, tank - burn, cost))
+        for target, left, spent in moves:
+            if spent < best.get((target, left), float('inf')):
+                best[(target, left)] = spent
+                heapq.heappush(heap, (spent, target, left))
+    return float('inf')
+
+
+def test_fuel_route_matches_brute_force():
+    planner = RoutePlanner(WORLD, lambda t: max(10, int(t * 25)), fuel_units)
+    ids = WORLD.location_ids
+    rng = random.Random(7)
+    for _ in range(40):
+        prices = np.array([rng.randint(10, 40) for _ in ids], dtype=np.float64)
+        capacity = rng.randint(3, 15)
+        fuel = rng.randint(0, capacity)
+        for origin in ids:
+            for destination in ids:
+                if origin == destination:
+                    continue
+                expected = brute_force_cost(WORLD, origin, destination, capacity, fuel, prices)
+                route = planner.fuel_route(origin, destination, capacity, fuel,
+                                           lambda rows: prices[rows], price_floor=prices.min())
+                if expected == float('inf'):
+                    assert route is None
+                else:
+                    assert route is not None and route.fuel_cost == expected, (origin, destination, capacity, fuel)
+
@@ -0,0 +1,47 @@
+"""Market prices depend on the seed, the day and trades - never on which days were read"""
+
+import numpy as np
+
+from tradewinds_adventure import WORLD
+from tradewinds_market import MarketEngine
+
+
+def prices_after(read_days, trade_day=None):
+    market = MarketEngine.from_world(WORLD, seed=11, price_impact=True)
+    origin, neighbour = WORLD.location_ids[:2]
+    for day in range(1, 31):
+        market.advance_to(day)
+        if day in read_days:
+            market.materialize()
+        if day == trade_day:
+            market.execute_trade(origin, 'fuel', 60)
+            market.execute_trade(neighbour, 'fuel', -60)
+    return market.materialize().copy()
+
+
+def test_reads_do_not_change_prices():
+    assert np.array_equal(prices_after(set()), prices_after(set(range(31))))
+    assert np.array_equal(prices_after({10}, trade_day=10), prices_after({5, 10, 20}, trade_day=10))
+
+
+def test_quote_matches_later_read():
+    market = MarketEngine.from_world(WORLD, seed=11)
+    location = WORLD.location_ids[3]
+    quoted = market.quote(location, 'food', 40)
+    market.materialize()
+    market.advance_to(40)
+    assert market.view(location)['food'] == quoted
+
+
+def test_route_edits_reach_the_trade_graph():
+    market = MarketEngine.from_world(WORLD, seed=11)
+    origin, dest = WORLD.location_ids[0], WORLD.location_ids[-1]
+    before = market._edge_dst.size
+    WORLD.set_route(origin, dest, 4.0)
+    try:
+        market.advance_to(1)
+        assert market._edge_dst.size == before + 1
+    finally:
+        WORLD.close_route(origin, dest)
+    market.advance_to(2)
+    assert market._edge_dst.size == before
@@ -0,0 +1,27 @@
+"""Sparse price history: buffers per traded location, evicted oldest-first"""
+
+import numpy as np
+
+from tradewinds_market import HISTORY_DEPTH, PriceHistory
+
+
+def test_depth_does_not_shrink_with_galaxy_size():
+    history = PriceHistory(100_000, 10)
+    assert history.depth == HISTORY_DEPTH
+    assert history.nbytes < PriceHistory.bytes_for(100_000, 10, 2)
+
+
+def test_least_recently_recorded_location_is_evicted():
+    budget = PriceHistory.bytes_for(2, 3, 4)
+    history = PriceHistory(10, 3, budget, depth=4)
+    for day, row in enumerate([1, 2, 1, 5]):
+        history.record(np.array([row]), day, np.full((1, 3), day))
+    assert history.series(1, 0)[0].tolist() == [0, 2]
+    assert history.series(2, 0)[0].size == 0
+    assert history.series(5, 0)[0].tolist() == [3]
+
+
+def test_days_beyond_int32():
+    history = PriceHistory(1, 1)
+    history.record(np.array([0]), 3_000_000_000, np.ones((1, 1)))
+    assert history.series(0, 0)[0].tolist() == [3_000_000_000]
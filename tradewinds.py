@@ -1,9 +1,13 @@
 # TradeWinds - Space Trading Game
 # A text adventure space trading game
 
-import random
+import math
 from typing import Dict, List
 
+from tradewinds_market import MarketEngine, MarketView
+from tradewinds_destinations import Destination, DestinationCache
+from tradewinds_spatial import SpatialIndex, system_position
+
 class Player:
     """Represents the player character with their ship, inventory, and status"""
     
@@ -84,16 +88,12 @@ class Player:
 class Commodity:
     """Represents a tradeable commodity"""
     
-    def __init__(self, name: str, base_price: int, volatility: float = 0.2):
+    def __init__(self, name: str, base_price: int, volatility: float = 0.2,
+                 elasticity: float = 0.005):
         self.name = name
         self.base_price = base_price
         self.volatility = volatility  # Price variation factor
-    
-    def get_market_price(self, supply_demand: float = 1.0) -> int:
-        """Calculate current market price based on supply/demand"""
-        variation = random.uniform(-self.volatility, self.volatility)
-        price = self.base_price * (1 + variation) * supply_demand
-        return max(1, int(price))  # Minimum price of 1 credit
+        self.elasticity = elasticity  # Log-price shift per unit traded
 
 class Location:
     """Represents a space station, planet, or colony"""
@@ -107,43 +107,27 @@ class Location:
         self.produces = produces or []  # Commodities this location produces (cheaper)
         self.consumes = consumes or []  # Commodities this location needs (expensive)
         self.distance_from_earth = distance_from_earth  # Light years
-        
-        # Generate current market prices
-        self.market_prices: Dict[str, int] = {}
-        self._generate_market_prices()
+        self.position = system_position(system, distance_from_earth)  # Light-year x, y, z
+    
+    @property
+    def market_prices(self) -> MarketView:
+        """Current market prices (a read-only view into the galaxy price matrix)"""
+        return MARKET.view(self.name)
     
     def _generate_market_prices(self):
         """Generate current market prices based on supply/demand"""
-        for commodity_name, commodity in COMMODITIES.items():
-            # Base supply/demand factor
-            supply_demand = 1.0
-            
-            # Producers have lower prices (more supply)
-            if commodity_name in self.produces:
-                supply_demand = random.uniform(0.6, 0.8)
-            
-            # Consumers have higher prices (more demand)
-            elif commodity_name in self.consumes:
-                supply_demand = random.uniform(1.2, 1.6)
-            
-            # Normal market fluctuation for other goods
-            else:
-                supply_demand = random.uniform(0.9, 1.1)
-            
-            self.market_prices[commodity_name] = commodity.get_market_price(supply_demand)
+        MARKET.regenerate([self.name])
     
     def refresh_market(self):
         """Refresh market prices (call when player visits or time passes)"""
         self._generate_market_prices()
     
     def get_distance_to(self, other_location: 'Location') -> float:
-        """Calculate travel distance to another location (simplified)"""
-        # Simplified calculation - in reality would use 3D coordinates
+        """Calculate travel distance to another location in light years"""
         if self.system == other_location.system:
             return 0.1  # Same system
         else:
-            # Rough approximation based on distance from Earth
-            return abs(self.distance_from_earth - other_location.distance_from_earth) + 1
+            return math.dist(self.position, other_location.position)
 
 # Define common commodities
 COMMODITIES = {
@@ -279,6 +263,41 @@ LOCATIONS = {
     )
 }
 
+# All market prices live in one galaxy-wide matrix, filled in lazily
+MARKET = MarketEngine.from_catalog(COMMODITIES, LOCATIONS)
+
+# Nearest-neighbour index over every location's position
+SPATIAL = SpatialIndex([loc.position for loc in LOCATIONS.values()], list(LOCATIONS))
+
+# Destinations listed at once, closest first
+DESTINATION_LIMIT = 20
+
+# Fuel is charged per light year, with a minimum charge for any trip
+FUEL_CREDITS_PER_LY = 5
+MIN_FUEL_COST = 10
+
+def fuel_cost_for(distance: float) -> int:
+    """Credits of fuel for a trip of the given light years"""
+    return max(MIN_FUEL_COST, int(distance * FUEL_CREDITS_PER_LY))
+
+def fuel_range(credits: int) -> float:
+    """Farthest distance (light years) the given credits buy fuel for; negative below the minimum charge"""
+    if credits < MIN_FUEL_COST:
+        return -1.0
+    return (credits + 1) / FUEL_CREDITS_PER_LY  # int(distance * 5) <= credits below this
+
+def nearest_destinations(location_name: str) -> List[Destination]:
+    """The closest DESTINATION_LIMIT locations with their fuel costs (positions never move)"""
+    origin = LOCATIONS[location_name]
+    destinations = []
+    for loc_name, _ in SPATIAL.nearest(origin.position, DESTINATION_LIMIT, exclude=[location_name]):
+        distance = origin.get_distance_to(LOCATIONS[loc_name])
+        destinations.append(Destination(loc_name, max(1, int(distance)), fuel_cost_for(distance), distance))
+    return destinations
+
+# Destination tables per location, reused by every listing
+DESTINATIONS = DestinationCache(nearest_destinations)
+
 def create_player() -> Player:
     """Create and initialize a new player"""
     print("Welcome to TradeWinds - The Space Trading Adventure!")
@@ -329,24 +348,27 @@ def show_market_prices(location: Location):
         
         print(f"{commodity:<18} | {price:>8} | {notes}")
 
-def list_destinations(current_location: Location):
-    """Show available travel destinations"""
+def list_destinations(current_location: Location, credits: int = None):
+    """Show the nearest travel destinations"""
     print(f"\n=== Travel Destinations from {current_location.name} ===")
     print("Destination                 | System        | Distance (ly)")
     print("-" * 60)
     
+    table = DESTINATIONS.table(current_location.name)
     destinations = []
-    for loc_name, location in LOCATIONS.items():
-        if loc_name != current_location.name:
-            distance = current_location.get_distance_to(location)
-            destinations.append((loc_name, location, distance))
-    
-    # Sort by distance
-    destinations.sort(key=lambda x: x[2])
+    for dest in table.entries[:DESTINATION_LIMIT]:
+        destinations.append((dest.id, LOCATIONS[dest.id], dest.distance))
     
     for i, (name, location, distance) in enumerate(destinations, 1):
         print(f"{i:2}. {name:<25} | {location.system:<12} | {distance:.1f}")
     
+    if credits is not None:
+        reach = fuel_range(credits)
+        in_range = []
+        if reach >= 0:
+            in_range = SPATIAL.within(current_location.position, reach, exclude=[current_location.name])
+        print(f"\n{len(in_range)} destination(s) within fuel range.")
+    
     return destinations
 
 def travel_to_location(player: Player, destination_name: str):
@@ -358,14 +380,14 @@ def travel_to_location(player: Player, destination_name: str):
         # Calculate travel time and cost
         distance = old_location.get_distance_to(new_location)
         travel_time = max(1, int(distance))
-        fuel_cost = max(10, int(distance * 5))
+        fuel_cost = fuel_cost_for(distance)
         
         if player.spend_credits(fuel_cost):
             player.current_location = destination_name
             player.days_elapsed += travel_time
             
-            # Refresh market at new location
-            new_location.refresh_market()
+            # Markets go stale as time passes; they are recomputed when next read
+            MARKET.advance_to(player.days_elapsed)
             
             print(f"\n🚀 Traveling to {destination_name}...")
             print(f"Travel time: {travel_time} days")
@@ -531,11 +553,11 @@ def main():
             
         elif command == "destinations":
             current_location = LOCATIONS[player.current_location]
-            destinations = list_destinations(current_location)
+            destinations = list_destinations(current_location, player.credits)
             
         elif command == "travel":
             current_location = LOCATIONS[player.current_location]
-            destinations = list_destinations(current_location)
+            destinations = list_destinations(current_location, player.credits)
             
             try:
                 choice = input("\nEnter destination number (or 'back'): ").strip()
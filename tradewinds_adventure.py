@@ -3,12 +3,21 @@ TradeWinds: A Space Trading Text Adventure
 Classic parser-based interactive fiction with rich descriptions
 """
 
+import math
 import random
 import re
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional
 from dataclasses import dataclass
 from enum import Enum
 
+from tradewinds_commands import QUANTITY_ALL, QUANTITY_SOME, CommandParser, CommandRegistry, ParsedCommand
+from tradewinds_destinations import Destination, DestinationCache
+from tradewinds_lookup import CommodityResolver, DestinationResolver, SpellingIndex
+from tradewinds_market import MarketEngine
+from tradewinds_planner import LoopPlanner
+from tradewinds_routes import RoutePlanner
+from tradewinds_world import CommodityRecord, LocationRecord, WorldStore
+
 # Game state and data structures
 @dataclass
 class GameState:
@@ -20,12 +29,18 @@ class GameState:
     max_cargo: int = 50
     days_elapsed: int = 0
     visited_locations: set = None
+    market_seed: int = None  # Same seed + same commands = identical markets
+    autopilot_reports: bool = False  # Describe every stop on multi-jump trips
+    fuel_capacity: Optional[int] = None  # Tank size in fuel units; None = pay for fuel per jump
+    fuel: int = 0  # Units in the tank (fuel-tank mode only)
     
     def __post_init__(self):
         if self.inventory is None:
             self.inventory = {}
         if self.visited_locations is None:
             self.visited_locations = {self.current_location}
+        if self.market_seed is None:
+            self.market_seed = random.getrandbits(64)
 
 class CommodityType(Enum):
     FOOD = "food"
@@ -39,67 +54,22 @@ class CommodityType(Enum):
     LUXURY = "luxury goods"
     MATERIALS = "raw materials"
 
-@dataclass
-class Commodity:
-    name: str
-    base_price: int
-    volatility: float
-    description: str
-
-@dataclass
-class Location:
-    id: str
-    name: str
-    system: str
-    short_desc: str
-    long_desc: str
-    atmosphere: str  # Atmospheric description
-    produces: List[str]
-    consumes: List[str]
-    distance_from_earth: float
-    connections: Dict[str, float]  # location_id -> travel_time
-    market_prices: Dict[str, int] = None
-    visited: bool = False
-    
-    def __post_init__(self):
-        if self.market_prices is None:
-            self.market_prices = {}
-            self._generate_prices()
-    
-    def _generate_prices(self):
-        for commodity_id, commodity in COMMODITIES.items():
-            base_price = commodity.base_price
-            volatility = commodity.volatility
-            
-            # Supply and demand modifiers
-            if commodity_id in self.produces:
-                supply_demand = random.uniform(0.6, 0.8)  # Cheaper where produced
-            elif commodity_id in self.consumes:
-                supply_demand = random.uniform(1.2, 1.6)  # Expensive where needed
-            else:
-                supply_demand = random.uniform(0.9, 1.1)  # Normal price
-            
-            # Add volatility
-            price_variation = random.uniform(-volatility, volatility)
-            final_price = int(base_price * supply_demand * (1 + price_variation))
-            self.market_prices[commodity_id] = max(1, final_price)
-
-# Game data
-COMMODITIES = {
-    "food": Commodity("food", 10, 0.15, "Nutritious sustenance for colonists and crews"),
-    "water": Commodity("water", 5, 0.10, "Pure H2O, essential for all life"),
-    "medicine": Commodity("medicine", 50, 0.30, "Advanced pharmaceuticals and medical supplies"),
-    "electronics": Commodity("electronics", 100, 0.25, "Computers, sensors, and electronic components"),
-    "metals": Commodity("metals", 25, 0.20, "Refined metals for construction and manufacturing"),
-    "textiles": Commodity("textiles", 15, 0.20, "Fabrics and clothing materials"),
-    "weapons": Commodity("weapons", 200, 0.40, "Military hardware and defensive systems"),
-    "fuel": Commodity("fuel", 20, 0.30, "Hydrogen fuel for spacecraft propulsion"),
-    "luxury": Commodity("luxury goods", 150, 0.35, "Fine art, jewelry, and exotic delicacies"),
-    "materials": Commodity("raw materials", 8, 0.15, "Unprocessed ores and basic materials")
+# Game data, written by hand and stored as columns in WORLD below
+COMMODITY_DATA = {
+    "food": CommodityRecord("food", 10, 0.15, "Nutritious sustenance for colonists and crews", 0.004),
+    "water": CommodityRecord("water", 5, 0.10, "Pure H2O, essential for all life", 0.003),
+    "medicine": CommodityRecord("medicine", 50, 0.30, "Advanced pharmaceuticals and medical supplies", 0.008),
+    "electronics": CommodityRecord("electronics", 100, 0.25, "Computers, sensors, and electronic components", 0.006),
+    "metals": CommodityRecord("metals", 25, 0.20, "Refined metals for construction and manufacturing", 0.004),
+    "textiles": CommodityRecord("textiles", 15, 0.20, "Fabrics and clothing materials", 0.005),
+    "weapons": CommodityRecord("weapons", 200, 0.40, "Military hardware and defensive systems", 0.010),
+    "fuel": CommodityRecord("fuel", 20, 0.30, "Hydrogen fuel for spacecraft propulsion", 0.004),
+    "luxury": CommodityRecord("luxury goods", 150, 0.35, "Fine art, jewelry, and exotic delicacies", 0.010),
+    "materials": CommodityRecord("raw materials", 8, 0.15, "Unprocessed ores and basic materials", 0.003)
 }
 
-LOCATIONS = {
-    "earth_station": Location(
+LOCATION_DATA = [
+    LocationRecord(
         "earth_station", "Earth Station", "Sol System",
         "A massive orbital complex above humanity's birthworld",
         """Earth Station stretches endlessly before you, a gleaming testament to human 
@@ -112,10 +82,10 @@ LOCATIONS = {
         ["luxury", "electronics", "medicine"], 
         ["materials", "metals"], 
         0, 
-        {"mars_colony": 0.5, "europa_station": 1.0, "titan_refinery": 1.5}
+        {"mars_colony": 0.5, "europa_station": 1.0, "titan_refinery": 1.5, "proxima_colony": 3.0}
     ),
     
-    "mars_colony": Location(
+    LocationRecord(
         "mars_colony", "New Olympia - Mars Colony", "Sol System", 
         "The first permanent settlement on the Red Planet",
         """New Olympia spreads across the rust-colored landscape of Mars, its domed 
@@ -132,7 +102,7 @@ LOCATIONS = {
         {"earth_station": 0.5, "europa_station": 0.8}
     ),
     
-    "europa_station": Location(
+    LocationRecord(
         "europa_station", "Europan Deep Station", "Sol System",
         "An ice-mining facility beneath Europa's frozen surface",
         """Deep beneath Europa's icy shell, Europan Deep Station exists in a cathedral 
@@ -149,7 +119,7 @@ LOCATIONS = {
         {"earth_station": 1.0, "mars_colony": 0.8, "titan_refinery": 1.2}
     ),
     
-    "titan_refinery": Location(
+    LocationRecord(
         "titan_refinery", "Titan Hydrocarbon Processing", "Sol System",
         "Industrial complex on Saturn's largest moon",
         """Titan Refinery squats like a mechanical beast on the surface of Saturn's 
@@ -166,7 +136,7 @@ LOCATIONS = {
         {"earth_station": 1.5, "europa_station": 1.2}
     ),
     
-    "proxima_colony": Location(
+    LocationRecord(
         "proxima_colony", "Port Centauri - Proxima Colony", "Alpha Centauri",
         "Humanity's first interstellar outpost",
         """Port Centauri represents the pinnacle of human achievement - the first 
@@ -181,10 +151,10 @@ LOCATIONS = {
         ["food"], 
         ["electronics", "medicine", "luxury"], 
         4.37,
-        {"sirius_hub": 2.0, "wolf359_outpost": 1.5}
+        {"sirius_hub": 2.0, "wolf359_outpost": 1.5, "earth_station": 3.0}
     ),
     
-    "sirius_hub": Location(
+    LocationRecord(
         "sirius_hub", "Sirius Commercial Station", "Sirius System",
         "The bright star system's major trading post",
         """Sirius Commercial Station floats in the brilliant light of the binary star 
@@ -202,7 +172,7 @@ LOCATIONS = {
         {"proxima_colony": 2.0, "vega_agricultural": 3.0, "altair_industrial": 2.5}
     ),
     
-    "vega_agricultural": Location(
+    LocationRecord(
         "vega_agricultural", "Vegan Breadbasket Worlds", "Vega System",
         "Vast agricultural colonies under a brilliant blue star",
         """The Vegan agricultural worlds stretch endlessly under the brilliant blue-white 
@@ -218,10 +188,10 @@ LOCATIONS = {
         ["food", "textiles"], 
         ["electronics", "metals", "medicine"], 
         25.3,
-        {"sirius_hub": 3.0, "altair_industrial": 2.8}
+        {"sirius_hub": 3.0, "altair_industrial": 2.8, "trappist_research": 3.5}
     ),
     
-    "altair_industrial": Location(
+    LocationRecord(
         "altair_industrial", "Altair Manufacturing Complex", "Altair System",
         "The forge worlds of human space",
         """Altair's industrial worlds burn with the fires of human ambition, their 
@@ -239,7 +209,7 @@ LOCATIONS = {
         {"sirius_hub": 2.5, "vega_agricultural": 2.8, "wolf359_outpost": 2.2}
     ),
     
-    "wolf359_outpost": Location(
+    LocationRecord(
         "wolf359_outpost", "Wolf's Den Mining Station", "Wolf 359",
         "A dangerous but profitable mining operation",
         """Wolf's Den clings to a barren asteroid in the crimson light of Wolf 359, 
@@ -257,7 +227,7 @@ LOCATIONS = {
         {"proxima_colony": 1.5, "altair_industrial": 2.2}
     ),
     
-    "trappist_research": Location(
+    LocationRecord(
         "trappist_research", "TRAPPIST-1 Science Station", "TRAPPIST-1",
         "Cutting-edge research in a seven-planet system",
         """TRAPPIST Research Station orbits in the habitable zone of the ultra-cool 
@@ -272,10 +242,10 @@ LOCATIONS = {
         ["medicine", "electronics"], 
         ["food", "luxury"], 
         39.5,
-        {"gliese_station": 2.0, "kepler_paradise": 8.0}
+        {"gliese_station": 2.0, "kepler_paradise": 8.0, "vega_agricultural": 3.5}
     ),
     
-    "gliese_station": Location(
+    LocationRecord(
         "gliese_station", "Gliese Frontier Observatory", "Gliese 581",
         "Humanity's far reach into the galaxy",
         """Gliese Frontier Observatory represents humanity's reach into the distant 
@@ -293,7 +263,7 @@ LOCATIONS = {
         {"trappist_research": 2.0}
     ),
     
-    "kepler_paradise": Location(
+    LocationRecord(
         "kepler_paradise", "New Eden Colony - Kepler-452b", "Kepler-452",
         "An Earth-like paradise in the far reaches",
         """New Eden Colony on Kepler-452b is humanity's crown jewel, a world so similar 
@@ -310,7 +280,136 @@ LOCATIONS = {
         1400,
         {"trappist_research": 8.0}
     )
+]
+
+WORLD = WorldStore.from_records(COMMODITY_DATA, LOCATION_DATA)
+COMMODITIES = WORLD.commodities  # id -> Commodity view
+LOCATIONS = WORLD.locations      # id -> Location view
+
+# Short names players use for places, on top of every word of each name, system and id
+DESTINATION_ALIASES = {
+    "earth": "earth_station", "mars": "mars_colony", "europa": "europa_station",
+    "titan": "titan_refinery", "proxima": "proxima_colony", "sirius": "sirius_hub",
+    "vega": "vega_agricultural", "altair": "altair_industrial", "wolf": "wolf359_outpost",
+    "trappist": "trappist_research", "gliese": "gliese_station", "kepler": "kepler_paradise",
 }
+PLACES = DestinationResolver.from_world(WORLD, DESTINATION_ALIASES)
+GOODS = CommodityResolver.from_world(WORLD)
+
+# All market prices live in one galaxy-wide matrix, filled in lazily
+MARKET = MarketEngine.from_world(WORLD, price_impact=True)
+WORLD.market = MARKET
+
+# Fuel-tank mode: units burnt per day of travel, and the tank fitted by 'tank on'
+FUEL_UNITS_PER_DAY = 1.25
+DEFAULT_TANK_CAPACITY = 10
+# Largest tank 'tank <units>' will fit
+MAX_TANK_CAPACITY = 500
+
+# Business loans: the quoted rate accrues over this many days, compounded daily
+LOAN_RATE_PERIOD_DAYS = 365
+
+# Most days one 'wait' (or any single time step) may cover
+MAX_WAIT_DAYS = 3650
+
+def core_commands(registry: CommandRegistry, game: 'TextAdventure'):
+    """Help, looking around, status and game commands"""
+    def examine(cmd: ParsedCommand):
+        args = cmd.args
+        if not args or args[0] in ('around', 'here'):
+            game.look_around()
+        elif args[0] in ('location', 'station', 'place'):
+            game.describe_location()
+        elif args[0] in ('market', 'prices'):
+            game.show_market()
+        elif args[0] in ('ship', 'starship'):
+            game.describe_ship()
+        else:
+            game.examine_commodity(cmd.rest)
+    
+    registry.register('help', lambda cmd: game.show_help(), ['?'])
+    registry.register('commands', lambda cmd: game.show_full_commands())
+    registry.register('look', examine, game.examine_commands)
+    registry.register('inventory', lambda cmd: game.show_inventory(), game.inventory_commands)
+    registry.register('status', lambda cmd: game.show_status(), game.status_commands)
+    registry.register('quit', lambda cmd: game.quit_game(), ['exit', 'q'])
+    registry.register('save', lambda cmd: print("Save game feature not implemented yet."))
+    registry.register('load', lambda cmd: print("Load game feature not implemented yet."))
+
+def travel_commands(registry: CommandRegistry, game: 'TextAdventure'):
+    """Travel, route planning, the fuel tank and waiting"""
+    def travel(cmd: ParsedCommand):
+        if cmd.args:
+            game.travel_to(cmd.rest, cmd.target)
+        else:
+            print("Travel where? Try 'travel <destination>' or 'destinations' to see options.")
+    
+    def route(cmd: ParsedCommand):
+        if cmd.args:
+            game.show_route(cmd.rest, cmd.target)
+        else:
+            print("Route to where? Try 'route <destination>'.")
+    
+    registry.register('travel', travel, game.movement_commands, module='travel', takes='place')
+    registry.register('destinations', lambda cmd: game.show_destinations(), ['exits', 'routes'],
+                      module='travel')
+    registry.register('route', route, ['plot', 'course'], module='travel', takes='place')
+    registry.register('tank', lambda cmd: game.handle_tank_command(list(cmd.args)), ['fuel'], module='travel')
+    registry.register('autopilot', lambda cmd: game.set_autopilot_reports(list(cmd.args)), module='travel')
+    registry.register('wait', lambda cmd: game.wait(list(cmd.args)), ['dock', 'rest'], module='travel')
+
+def trading_commands(registry: CommandRegistry, game: 'TextAdventure'):
+    """Markets, buying and selling, and trade planning"""
+    def buy(cmd: ParsedCommand):
+        if cmd.subject:
+            game.buy_commodity(cmd)
+        else:
+            print("Buy what? Try 'buy <commodity>' or 'market' to see available goods.")
+    
+    def sell(cmd: ParsedCommand):
+        if cmd.subject:
+            game.sell_commodity(cmd)
+        else:
+            print("Sell what? Try 'sell <commodity>' or 'inventory' to see what you have.")
+    
+    def plan(cmd: ParsedCommand):
+        if cmd.args and cmd.args[0].isdigit():
+            game.show_trade_plan(int(cmd.args[0]))
+        else:
+            game.show_trade_plan()
+    
+    registry.register('market', lambda cmd: game.show_market(), game.market_commands, module='trading')
+    registry.register('buy', buy, game.buy_commands, module='trading', takes='commodity', counted=True)
+    registry.register('sell', sell, game.sell_commands, module='trading', takes='commodity', counted=True)
+    registry.register('opportunities', lambda cmd: game.show_opportunities(), ['deals', 'arbitrage'],
+                      module='trading')
+    registry.register('plan', plan, ['loop'], module='trading')
+
+def business_commands(registry: CommandRegistry, game: 'TextAdventure'):
+    """Incorporation, licenses, loans, contracts and reputation"""
+    registry.register('business', lambda cmd: game.show_business_options(), module='business')
+    registry.register('incorporate', lambda cmd: game.incorporate_business(), ['register'],
+                      module='business')
+    registry.register('license', lambda cmd: game.get_business_license(), module='business')
+    registry.register('loan', lambda cmd: game.apply_business_loan(), module='business')
+    registry.register('contract', lambda cmd: game.view_contracts(), ['contracts'], module='business')
+    registry.register('reputation', lambda cmd: game.check_reputation(), module='business')
+
+def factory_commands(registry: CommandRegistry, game: 'TextAdventure'):
+    """Building and listing factories"""
+    def automate(cmd: ParsedCommand):
+        if cmd.args:
+            game.build_commodity_factory(cmd.args[0])
+        else:
+            print("Automate what? Try 'automate food' or 'automate electronics'")
+    
+    registry.register('factory', lambda cmd: game.show_factory_options(), module='factory')
+    registry.register('factories', lambda cmd: game.list_factories(), module='factory')
+    registry.register('build', lambda cmd: game.build_factory(list(cmd.args)), ['construct'], module='factory')
+    registry.register('automate', automate, module='factory')
+
+# Command modules installed into every new game, in order
+COMMAND_MODULES = [core_commands, travel_commands, trading_commands, business_commands, factory_commands]
 
 class TextAdventure:
     def __init__(self):
@@ -318,10 +417,34 @@ class TextAdventure:
         self.running = True
         self.current_location_obj = LOCATIONS[self.state.current_location]
         
+        # Markets follow a path fixed by the seed and the game day; only trades move them off it
+        MARKET.reseed(self.state.market_seed, self.state.days_elapsed)
+        
+        # Multi-hop routes, cached until the travel graph changes
+        self.routes = RoutePlanner(WORLD, self.calculate_fuel_cost, self.fuel_units)
+        self.loop_planner = LoopPlanner(WORLD, MARKET, self.calculate_fuel_cost)
+        
+        # Direct destinations per location, costed once per travel graph and fuel formula
+        # (bump fuel_formula_version whenever calculate_fuel_cost would price differently)
+        self.fuel_formula_version = 0
+        self.destinations = DestinationCache(
+            self.direct_destinations, lambda: (WORLD.graph_version, self.fuel_formula_version)
+        )
+        
+        
         # Command history
         self.command_history = []
         self.help_shown = False
         
+        # Business and factory state
+        self.business_registered = False
+        self.business_name = None
+        self.business_reputation = 0
+        self.business_licenses = []
+        self.business_loans = []
+        self.corporate_contracts = []
+        self.factories = {}
+        
         # Parser patterns
         self.movement_commands = {
             'travel', 'go', 'move', 'journey', 'fly', 'depart', 'leave'
@@ -344,6 +467,23 @@ class TextAdventure:
         self.status_commands = {
             'status', 'stats', 'info', 'talents', 'money', 'credits'
         }
+        
+        # Every verb and alias -> handler, filled in by the command modules
+        self.commands = CommandRegistry()
+        for module in COMMAND_MODULES:
+            module(self.commands, self)
+        
+        # Command lines parsed once each; destination and commodity names resolved at parse time,
+        # and cached parses dropped when the resolvers (or their vocabulary) change
+        self.parser = CommandParser(
+            self.commands,
+            {'place': lambda text: PLACES.resolve(text), 'commodity': lambda text: GOODS.resolve(text)},
+            version=lambda: (PLACES, PLACES.version, GOODS, GOODS.version)
+        )
+        
+        # Known verbs, places and commodities for "did you mean" hints, grown on first use
+        self.spelling = SpellingIndex()
+        self.spelling_version = -1
     
     def start_game(self):
         self.print_title()
@@ -401,82 +541,12 @@ class TextAdventure:
         return input(f"{self.state.player_name}> ").strip().lower()
     
     def parse_command(self, command: str):
-        words = command.split()
-        if not words:
+        parsed = self.parser.parse(command)
+        if parsed is None:
             return
         
-        verb = words[0]
-        args = words[1:] if len(words) > 1 else []
-        
-        # Help system
-        if verb in ['help', '?']:
-            self.show_help()
-        
-        # Movement commands
-        elif verb in self.movement_commands:
-            if args:
-                destination = ' '.join(args)
-                self.travel_to(destination)
-            else:
-                print("Travel where? Try 'travel <destination>' or 'destinations' to see options.")
-        
-        elif verb in ['destinations', 'exits', 'routes']:
-            self.show_destinations()
-        
-        # Examination commands
-        elif verb in self.examine_commands:
-            if not args or args[0] in ['around', 'here']:
-                self.look_around()
-            elif args[0] in ['location', 'station', 'place']:
-                self.describe_location()
-            elif args[0] in ['market', 'prices']:
-                self.show_market()
-            elif args[0] in ['ship', 'starship']:
-                self.describe_ship()
-            elif ' '.join(args) in COMMODITIES:
-                self.examine_commodity(' '.join(args))
-            else:
-                commodity = ' '.join(args)
-                self.examine_commodity(commodity)
-        
-        # Inventory and status
-        elif verb in self.inventory_commands:
-            self.show_inventory()
-        
-        elif verb in self.status_commands:
-            self.show_status()
-        
-        # Trading commands
-        elif verb in self.market_commands:
-            self.show_market()
-        
-        elif verb in self.buy_commands:
-            if args:
-                commodity = ' '.join(args)
-                self.buy_commodity(commodity)
-            else:
-                print("Buy what? Try 'buy <commodity>' or 'market' to see available goods.")
-        
-        elif verb in self.sell_commands:
-            if args:
-                commodity = ' '.join(args)
-                self.sell_commodity(commodity)
-            else:
-                print("Sell what? Try 'sell <commodity>' or 'inventory' to see what you have.")
-        
-        # System commands
-        elif verb in ['quit', 'exit', 'q']:
-            self.quit_game()
-        
-        elif verb in ['save']:
-            print("Save game feature not implemented yet.")
-        
-        elif verb in ['load']:
-            print("Load game feature not implemented yet.")
-        
-        # Unknown command
-        else:
-            self.unknown_command(command)
+        if not self.commands.dispatch(parsed):
+            self.unknown_command(parsed.text)
     
     def show_help(self):
         print("🚀 TRADEWINDS - BASIC COMMANDS")
@@ -496,6 +566,12 @@ class TextAdventure:
         print("  business             - Business incorporation options")
         print("  factory              - Build automated facilities")
         print("  destinations         - Show travel routes")
+        print("  route <place>        - Plot a multi-hop course")
+        print("  autopilot quiet|verbose - Narrate stops on long trips")
+        print("  tank on|off          - Fly with a limited fuel tank")
+        print("  opportunities        - Best trades to any reachable station")
+        print("  plan                 - Most profitable trade loop")
+        print("  wait <days>          - Stay docked while time passes")
         print()
         print("EXAMPLES:")
         print("  'go to mars', 'buy some food', 'examine electronics'")
@@ -514,6 +590,11 @@ class TextAdventure:
         print("  go to <destination>       - Same as travel")
         print("  fly to <destination>      - Same as travel")
         print("  destinations             - Show available routes & costs")
+        print("  route <destination>       - Plot the fastest multi-hop course")
+        print("  autopilot verbose|quiet   - Describe or skip stops on autopilot trips")
+        print("  tank on|off|<units>       - Fuel-tank mode with refuelling stops")
+        print("  wait <days>               - Stay docked while days pass")
+        print("  dock for <days>           - Same as wait")
         print()
         print("🔍 EXPLORATION & INFORMATION:")
         print("  look                     - Examine current location")
@@ -529,6 +610,8 @@ class TextAdventure:
         print("  purchase <commodity>     - Same as buy")
         print("  sell <commodity>         - Sell goods from cargo")
         print("  trade <commodity>        - Same as sell")
+        print("  opportunities            - Most profitable trades to any reachable station")
+        print("  plan [jumps]             - Best talents-per-day trade loop")
         print()
         print("📊 STATUS & INVENTORY:")
         print("  status                   - Show credits, location, stats")
@@ -566,7 +649,7 @@ class TextAdventure:
         print("  • Factories provide passive income over time")
         print("  • Higher reputation = better contracts & loan rates")
     
-    def look_around(self):
+    def look_around(self, hints: bool = True):
         loc = self.current_location_obj
         if not loc.visited:
             print(f"**{loc.name.upper()}**")
@@ -591,9 +674,10 @@ class TextAdventure:
                 consumes_str = ", ".join(loc.consumes)
                 print(f"High demand for: {consumes_str}")
         
-        print()
-        print("Type 'destinations' to see where you can travel.")
-        print("Type 'market' to check commodity prices.")
+        if hints:
+            print()
+            print("Type 'destinations' to see where you can travel.")
+            print("Type 'market' to check commodity prices.")
     
     def describe_location(self):
         loc = self.current_location_obj
@@ -618,40 +702,189 @@ class TextAdventure:
         print(f"Talents available: ╬{self.state.talents:,}")
         print(f"Days traveled: {self.state.days_elapsed}")
     
+    def direct_destinations(self, location_id: str) -> List[Destination]:
+        """Direct routes from a location, quickest first"""
+        connections = LOCATIONS[location_id].connections
+        return sorted(
+            (Destination(dest_id, travel_time, self.calculate_fuel_cost(travel_time))
+             for dest_id, travel_time in connections.items()),
+            key=lambda dest: dest.travel_time
+        )
+    
     def show_destinations(self):
         loc = self.current_location_obj
         print(f"From {loc.name}, you can travel to:")
         print()
         
-        destinations = []
-        for dest_id, travel_time in loc.connections.items():
-            dest_loc = LOCATIONS[dest_id]
-            fuel_cost = self.calculate_fuel_cost(travel_time)
-            destinations.append((dest_loc, travel_time, fuel_cost))
-        
-        # Sort by travel time
-        destinations.sort(key=lambda x: x[1])
-        
-        for dest_loc, travel_time, fuel_cost in destinations:
+        table = self.destinations.table(loc.id)
+        for dest, affordable in table.view(self.state.talents):
+            dest_loc = LOCATIONS[dest.id]
             print(f"  {dest_loc.name} ({dest_loc.system})")
-            print(f"    Travel time: {travel_time} days")
-            print(f"    Fuel cost: {fuel_cost} talents")
-            if self.state.talents < fuel_cost:
+            print(f"    Travel time: {dest.travel_time} days")
+            print(f"    Fuel cost: {dest.fuel_cost} talents")
+            if not affordable:
                 print("    ⚠️  Insufficient talents for fuel!")
             print()
         
-        if not destinations:
+        if not table:
             print("No direct routes available from this location.")
     
+    def show_route(self, destination: str, dest_id: Optional[str] = None):
+        dest_id = dest_id or self.find_destination(destination)
+        if not dest_id:
+            print(f"I don't know how to get to '{destination}'.")
+            self.suggest_destination(destination)
+            return
+        
+        dest_loc = LOCATIONS[dest_id]
+        if dest_id == self.state.current_location:
+            print(f"You're already at {dest_loc.name}.")
+            return
+        
+        if self.state.fuel_capacity is not None:
+            route = self.plan_route(dest_id)
+            if route is None:
+                print(f"No route to {dest_loc.name} stays within your tank's range.")
+                return
+            print(f"**COURSE TO {dest_loc.name.upper()}**")
+            print()
+            self.print_route("Cheapest route with refuelling", route)
+            print(f"Type 'travel {destination}' to fly it on autopilot.")
+            return
+        
+        fastest = self.routes.route(self.state.current_location, dest_id, 'time')
+        if fastest is None:
+            print(f"No known route leads to {dest_loc.name} from here.")
+            return
+        cheapest = self.routes.route(self.state.current_location, dest_id, 'fuel')
+        
+        print(f"**COURSE TO {dest_loc.name.upper()}**")
+        print()
+        self.print_route("Fastest route", fastest)
+        if cheapest.stops != fastest.stops:
+            self.print_route("Cheapest route", cheapest)
+        if fastest.hops > 1:
+            print(f"Type 'travel {destination}' to fly the fastest route on autopilot.")
+    
+    def fuel_units(self, travel_time: float) -> int:
+        """Fuel units a jump burns in fuel-tank mode"""
+        return max(1, math.ceil(travel_time * FUEL_UNITS_PER_DAY))
+    
+    def plan_route(self, dest_id: str):
+        """The route autopilot flies: fastest, or cheapest with refuelling stops when a tank is fitted"""
+        if self.state.fuel_capacity is None:
+            return self.routes.route(self.state.current_location, dest_id, 'time')
+        fuel = MARKET.commodity_index['fuel']
+
+        def fuel_prices(rows):
+            # Priced without storing, and only for the stations the search reaches
+            return MARKET.prices_on(MARKET.day, [WORLD.location_ids[row] for row in rows])[:, fuel]
+
+        # No market prices anything below one talent
+        return self.routes.fuel_route(self.state.current_location, dest_id,
+                                      self.state.fuel_capacity, self.state.fuel, fuel_prices, price_floor=1)
+    
+    def handle_tank_command(self, args: List[str]):
+        if args and args[0] in ['off', 'remove']:
+            self.state.fuel_capacity = None
+            self.state.fuel = 0
+            print("Fuel tank model off: fuel is paid for on every jump.")
+            return
+        if args and (args[0] in ['on', 'install'] or args[-1].isdigit()):
+            capacity = int(args[-1]) if args[-1].isdigit() else DEFAULT_TANK_CAPACITY
+            if capacity > MAX_TANK_CAPACITY:
+                print(f"No hull carries a tank that big. Fitting the largest one: {MAX_TANK_CAPACITY} units.")
+                capacity = MAX_TANK_CAPACITY
+            self.state.fuel_capacity = max(1, capacity)
+            self.state.fuel = min(self.state.fuel, self.state.fuel_capacity)
+        
+        if self.state.fuel_capacity is None:
+            print("Fuel tank model off: fuel is paid for on every jump.")
+            print("Type 'tank on' (or 'tank <units>') to fly with a limited tank and refuelling stops.")
+            return
+        jump_range = self.state.fuel_capacity / FUEL_UNITS_PER_DAY
+        print(f"⛽ Fuel tank: {self.state.fuel}/{self.state.fuel_capacity} units "
+              f"(longest jump: {jump_range:g} days)")
+        print("Autopilot buys fuel at the cheapest stops along each route.")
+    
+    def print_route(self, title: str, route):
+        print(f"{title}: {route.travel_time:g} days, ╬{route.fuel_cost} fuel, {route.hops} hop(s)")
+        for number, (origin, dest, travel_time) in enumerate(zip(route.stops, route.stops[1:], route.legs), 1):
+            if route.fuel_left is None:
+                cost = f"╬{self.calculate_fuel_cost(travel_time)}"
+            else:
+                cost = f"{self.fuel_units(travel_time)} fuel units"
+            print(f"  {number}. {LOCATIONS[origin].name} → {LOCATIONS[dest].name} "
+                  f"({travel_time} days, {cost})")
+        for location_id, units, cost in route.refuels:
+            print(f"  ⛽ Refuel {units} units at {LOCATIONS[location_id].name} (╬{cost})")
+        if route.fuel_cost > self.state.talents:
+            print("  ⚠️  Insufficient talents for the full journey!")
+        print()
+    
+    def show_opportunities(self):
+        loc = self.current_location_obj
+        # Every station reachable from here, with the fuel bill of its cheapest route
+        reachable = self.routes.reachable(loc.id, 'fuel')
+        destinations = list(reachable)
+        fuel_costs = [int(cost) for cost in reachable.values()]
+        deals = MARKET.opportunities(loc.id, destinations, fuel_costs,
+                                     self.state.talents, self.state.max_cargo - self.get_cargo_count())
+        
+        print(f"**TRADE OPPORTUNITIES FROM {loc.name.upper()}**")
+        print()
+        if not deals:
+            print("No profitable trades from here right now.")
+            print("Try again after prices move, or free up cargo space and talents.")
+            return
+        
+        for deal in deals:
+            dest_loc = LOCATIONS[deal.destination]
+            comm = COMMODITIES[deal.commodity]
+            print(f"  {deal.units} {comm.name} → {dest_loc.name}")
+            print(f"    Buy at ╬{deal.buy_price}, sell at ╬{deal.sell_price} "
+                  f"(fuel ╬{deal.fuel_cost} on the cheapest route)")
+            print(f"    Expected profit: ╬{deal.profit:,}")
+            print()
+        print("Prices include the effect of your own order on each market.")
+    
+    def show_trade_plan(self, max_hops: Optional[int] = None):
+        loc = self.current_location_obj
+        cargo_space = self.state.max_cargo - self.get_cargo_count()
+        loop = self.loop_planner.plan(loc.id, self.state.talents, cargo_space, max_hops)
+        
+        print(f"**BEST TRADE LOOP FROM {loc.name.upper()}**")
+        print()
+        if loop is None:
+            print("No round trip from here turns a profit right now.")
+            print("Free up cargo space, raise more talents, or allow longer loops ('plan 6').")
+            return
+        
+        for number, leg in enumerate(loop.legs, 1):
+            origin = LOCATIONS[leg.origin].name
+            dest = LOCATIONS[leg.destination].name
+            if leg.commodity:
+                cargo = f"carry {leg.units} {COMMODITIES[leg.commodity].name}"
+            else:
+                cargo = "fly empty"
+            print(f"  {number}. {origin} → {dest}: {cargo}")
+            print(f"     {leg.travel_time} days, fuel ╬{leg.fuel_cost}, net ╬{leg.profit:,}")
+        print()
+        print(f"Loop profit: ╬{loop.profit:,} over {loop.travel_time:g} days "
+              f"(╬{loop.per_day:,.0f} per day)")
+        if not loop.complete:
+            print("(Search stopped at its time limit; a better loop may exist.)")
+    
     def show_market(self):
         loc = self.current_location_obj
         print(f"**MARKET PRICES AT {loc.name.upper()}**")
         print()
-        print("Commodity          Price    Market Notes")
-        print("-" * 50)
+        print("Commodity          Price   Stock   Market Notes")
+        print("-" * 58)
         
         for comm_id, comm in COMMODITIES.items():
             price = loc.market_prices[comm_id]
+            stock = MARKET.available(loc.id, comm_id)
             notes = ""
             
             if comm_id in loc.produces:
@@ -661,7 +894,7 @@ class TextAdventure:
             else:
                 notes = "Standard pricing"
             
-            print(f"{comm.name:<18} {price:>3} cr   {notes}")
+            print(f"{comm.name:<18} {price:>3} cr {stock:>5}   {notes}")
         
         print()
         print("Type 'buy <commodity>' to purchase goods")
@@ -669,15 +902,11 @@ class TextAdventure:
         print("Type 'examine <commodity>' to learn more about an item")
     
     def examine_commodity(self, commodity_name: str):
-        # Try to find the commodity
-        comm_id = None
-        for cid, comm in COMMODITIES.items():
-            if commodity_name in comm.name or commodity_name == cid:
-                comm_id = cid
-                break
-        
+        comm_id = GOODS.resolve(commodity_name)
         if not comm_id:
             print(f"I don't recognize '{commodity_name}'.")
+            if self.suggest_commodity(commodity_name):
+                return
             print("Available commodities:", ", ".join([c.name for c in COMMODITIES.values()]))
             return
         
@@ -699,6 +928,18 @@ class TextAdventure:
         else:
             print("💰 Standard market pricing")
         
+        # Recent price trend at this station
+        days, prices = MARKET.price_history(loc.id, comm_id, last=5)
+        if len(prices) > 1:
+            history = ", ".join(f"╬{p}" for p in prices)
+            if prices[-1] > prices[0]:
+                trend = "rising 📈"
+            elif prices[-1] < prices[0]:
+                trend = "falling 📉"
+            else:
+                trend = "steady"
+            print(f"Recent prices here (since day {days[0]}): {history} - {trend}")
+        
         # Show inventory
         owned = self.state.inventory.get(comm_id, 0)
         if owned > 0:
@@ -734,23 +975,36 @@ class TextAdventure:
         print(f"System: {self.current_location_obj.system}")
         print(f"Days elapsed: {self.state.days_elapsed}")
         print(f"Cargo: {self.get_cargo_count()}/50 units")
+        if self.state.fuel_capacity is not None:
+            print(f"Fuel tank: {self.state.fuel}/{self.state.fuel_capacity} units")
         print(f"Locations visited: {len(self.state.visited_locations)}")
     
-    def travel_to(self, destination: str):
-        # Find matching destination
-        dest_id = self.find_destination(destination)
+    def travel_to(self, destination: str, dest_id: Optional[str] = None):
+        # Find matching destination, unless the parser already did
+        dest_id = dest_id or self.find_destination(destination)
         if not dest_id:
             print(f"I don't know how to get to '{destination}'.")
-            print("Type 'destinations' to see available routes.")
+            if not self.suggest_destination(destination):
+                print("Type 'destinations' to see available routes.")
             return
         
-        if dest_id not in self.current_location_obj.connections:
-            print(f"There's no direct route to {LOCATIONS[dest_id].name} from here.")
+        dest_loc = LOCATIONS[dest_id]
+        if dest_id == self.state.current_location:
+            print(f"You're already at {dest_loc.name}.")
+            return
+        
+        # Non-adjacent destinations are flown on autopilot (fastest, or cheapest with a tank)
+        route = self.plan_route(dest_id)
+        if route is None:
+            if self.state.fuel_capacity is not None:
+                print(f"No route to {dest_loc.name} stays within your tank's range.")
+            else:
+                print(f"There's no route to {dest_loc.name} from here.")
             print("Type 'destinations' to see available routes.")
             return
         
-        travel_time = self.current_location_obj.connections[dest_id]
-        fuel_cost = self.calculate_fuel_cost(travel_time)
+        travel_time = route.travel_time
+        fuel_cost = route.fuel_cost
         
         if self.state.talents < fuel_cost:
             print(f"You need {fuel_cost} talents for fuel, but you only have ╬{self.state.talents}.")
@@ -758,31 +1012,43 @@ class TextAdventure:
             return
         
         # Execute travel
-        dest_loc = LOCATIONS[dest_id]
         print(f"Preparing for departure to {dest_loc.name}...")
+        if route.hops > 1:
+            stops = ", ".join(LOCATIONS[stop].name for stop in route.stops[1:-1])
+            print(f"Autopilot engaged: {route.hops} jumps via {stops}")
         print(f"Fuel cost: {fuel_cost} talents")
-        print(f"Travel time: {travel_time} days")
+        print(f"Travel time: {travel_time:g} days")
         print()
         
+        for location_id, units, cost in route.refuels:
+            print(f"⛽ Refuelling {units} units at {LOCATIONS[location_id].name} for ╬{cost}")
+        
         self.state.talents -= fuel_cost
-        self.state.days_elapsed += int(travel_time)
+        if route.fuel_left is not None:
+            self.state.fuel = route.fuel_left
+        print("🚀 TRAVELING...")
+        print()
+        
+        # Intermediate stops are only narrated when the captain asks for it
+        for stop_id in route.stops[1:-1]:
+            self.state.visited_locations.add(stop_id)
+            if self.state.autopilot_reports:
+                self.current_location_obj = LOCATIONS[stop_id]
+                print(f"Autopilot waypoint: {self.current_location_obj.name}")
+                print()
+                self.look_around(hints=False)
+                print()
+        
         self.state.current_location = dest_id
         self.current_location_obj = dest_loc
         self.state.visited_locations.add(dest_id)
         
-        # Process factory income during travel
-        if self.factories and int(travel_time) > 0:
-            self.process_factory_income()
-        
-        # Regenerate market prices at destination
-        dest_loc._generate_prices()
-        
-        print("🚀 TRAVELING...")
-        print()
+        # Factories, loans and markets are settled once for the whole trip
+        self.advance_time(int(travel_time))
         
         # Arrival description
         if not dest_loc.visited:
-            print(f"After {travel_time} days of travel through the void, you arrive at")
+            print(f"After {travel_time:g} days of travel through the void, you arrive at")
             print(f"{dest_loc.name} in the {dest_loc.system}.")
         else:
             print(f"You arrive at the familiar sight of {dest_loc.name}.")
@@ -790,138 +1056,86 @@ class TextAdventure:
         print()
         self.look_around()
     
+    def set_autopilot_reports(self, args: List[str]):
+        if args and args[0] in ['verbose', 'on', 'reports']:
+            self.state.autopilot_reports = True
+        elif args and args[0] in ['quiet', 'off', 'silent']:
+            self.state.autopilot_reports = False
+        mode = "verbose" if self.state.autopilot_reports else "quiet"
+        print(f"Autopilot is {mode}: stops along multi-jump trips are "
+              f"{'described' if self.state.autopilot_reports else 'skipped'}.")
+        print("Use 'autopilot verbose' or 'autopilot quiet' to change it.")
+    
     def find_destination(self, destination: str) -> Optional[str]:
         """Find a location ID that matches the destination string"""
-        destination = destination.lower()
-        
-        for loc_id, loc in LOCATIONS.items():
-            if destination in loc.name.lower():
-                return loc_id
-            if destination in loc.system.lower():
-                return loc_id
-            if destination.replace(' ', '_') == loc_id:
-                return loc_id
-            # Check for common abbreviations
-            if 'earth' in destination and 'earth_station' == loc_id:
-                return loc_id
-            if 'mars' in destination and 'mars_colony' == loc_id:
-                return loc_id
-            if 'europa' in destination and 'europa_station' == loc_id:
-                return loc_id
-            if 'titan' in destination and 'titan_refinery' == loc_id:
-                return loc_id
-            if 'proxima' in destination and 'proxima_colony' == loc_id:
-                return loc_id
-            if 'sirius' in destination and 'sirius_hub' == loc_id:
-                return loc_id
-            if 'vega' in destination and 'vega_agricultural' == loc_id:
-                return loc_id
-            if 'altair' in destination and 'altair_industrial' == loc_id:
-                return loc_id
-            if 'wolf' in destination and 'wolf359_outpost' == loc_id:
-                return loc_id
-            if 'trappist' in destination and 'trappist_research' == loc_id:
-                return loc_id
-            if 'gliese' in destination and 'gliese_station' == loc_id:
-                return loc_id
-            if 'kepler' in destination and 'kepler_paradise' == loc_id:
-                return loc_id
-        
-        return None
+        return PLACES.resolve(destination)
     
     def calculate_fuel_cost(self, travel_time: float) -> int:
         return max(10, int(travel_time * 25))
     
-    def buy_commodity(self, commodity_name: str):
-        # Parse quantity if specified
-        words = commodity_name.split()
-        quantity = 1
-        
-        # Look for quantity words
-        if words[0].isdigit():
-            quantity = int(words[0])
-            commodity_name = ' '.join(words[1:])
-        elif 'some' in words:
-            quantity = 5
-            commodity_name = commodity_name.replace('some ', '')
-        elif 'all' in words:
-            commodity_name = commodity_name.replace('all ', '')
-        
-        # Find the commodity
-        comm_id = None
-        for cid, comm in COMMODITIES.items():
-            if commodity_name in comm.name or commodity_name == cid:
-                comm_id = cid
-                break
-        
+    def buy_commodity(self, order: ParsedCommand):
+        # Quantity and commodity were read by the parser; 'some' is five units, no quantity is one
+        commodity_name, comm_id = order.subject, order.target
+        quantity = {None: 1, QUANTITY_SOME: 5}.get(order.quantity, order.quantity)
         if not comm_id:
             print(f"I don't recognize '{commodity_name}'.")
-            print("Type 'market' to see available commodities.")
+            if not self.suggest_commodity(commodity_name):
+                print("Type 'market' to see available commodities.")
             return
         
         comm = COMMODITIES[comm_id]
-        price = self.current_location_obj.market_prices[comm_id]
+        loc = self.current_location_obj
+        price = loc.market_prices[comm_id]
         
-        # Calculate max affordable
-        max_affordable = self.state.talents // price
+        # Calculate max affordable from the station's stock (large orders push the price up)
+        in_stock = MARKET.available(loc.id, comm_id)
+        max_affordable = MARKET.max_affordable(loc.id, comm_id, self.state.talents)
         max_space = 50 - self.get_cargo_count()
         max_buyable = min(max_affordable, max_space)
         
         if max_buyable <= 0:
-            if max_affordable <= 0:
+            if in_stock <= 0:
+                print(f"The station has no {comm.name} left. Stocks recover over the next few days.")
+            elif max_affordable <= 0:
                 print(f"You can't afford any {comm.name}. Each unit costs ╬{price}.")
             else:
                 print("Your cargo hold is full! Sell something first.")
             return
         
         # Handle 'all' quantity
-        if 'all' in commodity_name or quantity > max_buyable:
+        if quantity == QUANTITY_ALL or quantity > max_buyable:
             quantity = max_buyable
             print(f"Buying maximum possible: {quantity} units")
         
         if quantity > max_buyable:
-            print(f"You can only buy {max_buyable} units (limited by talents or cargo space).")
+            print(f"You can only buy {max_buyable} units (limited by talents, stock or cargo space).")
             return
         
         # Execute purchase
-        total_cost = price * quantity
+        total_cost = MARKET.buy_quote(loc.id, comm_id, quantity)
         self.state.talents -= total_cost
         self.state.inventory[comm_id] = self.state.inventory.get(comm_id, 0) + quantity
+        MARKET.execute_trade(loc.id, comm_id, quantity)
         
         print(f"Purchased {quantity} units of {comm.name} for ╬{total_cost:,}.")
+        if total_cost != price * quantity:
+            print(f"Your order pushed the local price up to ╬{loc.market_prices[comm_id]} per unit.")
         print(f"Talents remaining: ╬{self.state.talents:,}")
         
         # Market commentary
-        if comm_id in self.current_location_obj.produces:
+        if comm_id in loc.produces:
             print("💡 Good buy! This commodity is produced locally, so prices are low.")
-        elif comm_id in self.current_location_obj.consumes:
+        elif comm_id in loc.consumes:
             print("⚠️  Expensive here! Consider selling this elsewhere for better profit.")
     
-    def sell_commodity(self, commodity_name: str):
-        # Parse quantity if specified
-        words = commodity_name.split()
-        quantity = None
-        
-        if words[0].isdigit():
-            quantity = int(words[0])
-            commodity_name = ' '.join(words[1:])
-        elif 'some' in words:
-            quantity = None  # Will ask for specific amount
-            commodity_name = commodity_name.replace('some ', '')
-        elif 'all' in words:
-            quantity = -1  # Sell all
-            commodity_name = commodity_name.replace('all ', '')
-        
-        # Find the commodity
-        comm_id = None
-        for cid, comm in COMMODITIES.items():
-            if commodity_name in comm.name or commodity_name == cid:
-                comm_id = cid
-                break
-        
+    def sell_commodity(self, order: ParsedCommand):
+        # Quantity and commodity were read by the parser; 'some' or no quantity asks how many
+        commodity_name, comm_id = order.subject, order.target
+        quantity = None if order.quantity == QUANTITY_SOME else order.quantity
         if not comm_id:
             print(f"I don't recognize '{commodity_name}'.")
-            print("Type 'inventory' to see what you have.")
+            if not self.suggest_commodity(commodity_name):
+                print("Type 'inventory' to see what you have.")
             return
         
         comm = COMMODITIES[comm_id]
@@ -931,7 +1145,8 @@ class TextAdventure:
             print(f"You don't have any {comm.name} to sell.")
             return
         
-        price = self.current_location_obj.market_prices[comm_id]
+        loc = self.current_location_obj
+        price = loc.market_prices[comm_id]
         
         # Determine quantity to sell
         if quantity is None:
@@ -941,7 +1156,7 @@ class TextAdventure:
             except ValueError:
                 print("Please enter a valid number.")
                 return
-        elif quantity == -1:  # Sell all
+        elif quantity == QUANTITY_ALL:
             quantity = owned
             print(f"Selling all {quantity} units")
         
@@ -954,19 +1169,22 @@ class TextAdventure:
             return
         
         # Execute sale
-        total_earned = price * quantity
+        total_earned = MARKET.sell_quote(loc.id, comm_id, quantity)
         self.state.talents += total_earned
         self.state.inventory[comm_id] -= quantity
         if self.state.inventory[comm_id] <= 0:
             del self.state.inventory[comm_id]
+        MARKET.execute_trade(loc.id, comm_id, -quantity)
         
         print(f"Sold {quantity} units of {comm.name} for ╬{total_earned:,}.")
+        if total_earned != price * quantity:
+            print(f"Your sale pushed the local price down to ╬{loc.market_prices[comm_id]} per unit.")
         print(f"Talents available: ╬{self.state.talents:,}")
         
         # Market commentary
-        if comm_id in self.current_location_obj.consumes:
+        if comm_id in loc.consumes:
             print("💰 Excellent sale! This commodity is in high demand here.")
-        elif comm_id in self.current_location_obj.produces:
+        elif comm_id in loc.produces:
             print("📉 Low prices here since it's locally produced. Consider selling elsewhere.")
     
     def get_cargo_count(self) -> int:
@@ -981,8 +1199,12 @@ class TextAdventure:
         ]
         print(random.choice(responses))
         
+        verb, _, rest = command.partition(' ')
+        suggestion = self.suggest_command(verb)
+        if suggestion:
+            print(f"💡 Did you mean '{' '.join([suggestion, rest]).strip()}'?")
         # Suggest alternatives based on partial matches
-        if any(word in command for word in ['go', 'move', 'travel']):
+        elif any(word in command for word in ['go', 'move', 'travel']):
             print("💡 Try 'travel <destination>' or 'destinations' to see where you can go.")
         elif any(word in command for word in ['buy', 'purchase']):
             print("💡 Try 'buy <commodity>' or 'market' to see what's available.")
@@ -991,22 +1213,31 @@ class TextAdventure:
         elif any(word in command for word in ['look', 'see', 'examine']):
             print("💡 Try 'look around', 'look location', or 'market'.")
     
-    def handle_business_command(self, verb: str, args: List[str]):
-        """Handle business-related commands"""
-        if verb == 'business':
-            self.show_business_options()
-        elif verb in ['incorporate', 'register']:
-            self.incorporate_business()
-        elif verb == 'license':
-            self.get_business_license()
-        elif verb == 'loan':
-            self.apply_business_loan()
-        elif verb == 'contract':
-            self.view_contracts()
-        elif verb == 'reputation':
-            self.check_reputation()
-        else:
-            print("Business command not recognized. Type 'business' for options.")
+    def suggest_command(self, verb: str) -> Optional[str]:
+        """The registered verb a mistyped one was probably meant to be"""
+        if self.spelling_version != self.commands.version:
+            for known in self.commands:
+                self.spelling.add('command', known)
+            self.spelling_version = self.commands.version
+        return self.spelling.nearest('command', verb, accept=lambda known: known in self.commands)
+    
+    def suggest_destination(self, destination: str) -> bool:
+        """Print the place a misspelled destination probably meant; False if none"""
+        self.spelling.sync_world(WORLD, DESTINATION_ALIASES)
+        corrected = self.spelling.correct('place', destination)
+        dest_id = PLACES.resolve(corrected) if corrected else None
+        if dest_id:
+            print(f"💡 Did you mean '{LOCATIONS[dest_id].name}'?")
+        return bool(dest_id)
+    
+    def suggest_commodity(self, commodity_name: str) -> bool:
+        """Print the commodity a misspelled name probably meant; False if none"""
+        self.spelling.sync_world(WORLD, DESTINATION_ALIASES)
+        corrected = self.spelling.correct('commodity', commodity_name)
+        comm_id = GOODS.resolve(corrected) if corrected else None
+        if comm_id:
+            print(f"💡 Did you mean '{COMMODITIES[comm_id].name.lower()}'?")
+        return bool(comm_id)
     
     def show_business_options(self):
         """Show business system options"""
@@ -1032,6 +1263,9 @@ class TextAdventure:
             print(f"Licenses: {len(self.business_licenses)}")
             print(f"Active Contracts: {len(self.corporate_contracts)}")
             print(f"Business Loans: {len(self.business_loans)}")
+            for loan in self.business_loans:
+                print(f"  ╬{loan['amount']:,} at {loan['interest']*100:.1f}% - "
+                      f"balance owed ╬{int(loan['remaining']):,}")
             print()
             print("Commands:")
             print("  license              - Get additional licenses")
@@ -1154,16 +1388,18 @@ class TextAdventure:
                 print("Minimum loan amount is ╬1,000.")
                 return
             
-            # Add loan
+            # Add loan; the balance starts at the principal and accrues interest day by day
             self.business_loans.append({
                 'amount': loan_amount,
                 'interest': interest,
-                'remaining': int(loan_amount * (1 + interest))
+                'remaining': float(loan_amount)
             })
             self.state.talents += loan_amount
             
             print(f"✅ Loan approved! ╬{loan_amount:,} added to your account.")
-            print(f"Total to repay: ╬{int(loan_amount * (1 + interest)):,}")
+            print(f"Interest accrues at {interest*100:.1f}% a year, compounded daily "
+                  f"(╬{int(loan_amount * (1 + interest / LOAN_RATE_PERIOD_DAYS) ** LOAN_RATE_PERIOD_DAYS):,} "
+                  f"owed after a year).")
             
         except ValueError:
             print("Invalid amount entered.")
@@ -1220,22 +1456,6 @@ class TextAdventure:
         print("  • Complete contracts")
         print("  • Build profitable factories")
     
-    def handle_factory_command(self, verb: str, args: List[str]):
-        """Handle factory-related commands"""
-        if verb == 'factory':
-            self.show_factory_options()
-        elif verb == 'factories':
-            self.list_factories()
-        elif verb in ['build', 'construct']:
-            self.build_factory(args)
-        elif verb == 'automate':
-            if args:
-                self.build_commodity_factory(args[0])
-            else:
-                print("Automate what? Try 'automate food' or 'automate electronics'")
-        else:
-            print("Factory command not recognized. Type 'factory' for options.")
-    
     def show_factory_options(self):
         """Show factory system options"""
         print()
@@ -1379,29 +1599,68 @@ class TextAdventure:
             'metals': 'mining'
         }
         
-        # Find matching commodity
-        factory_type = None
-        for comm_id, comm in COMMODITIES.items():
-            if commodity.lower() in comm.name.lower() or commodity.lower() == comm_id:
-                if comm_id in commodity_map:
-                    factory_type = commodity_map[comm_id]
-                    break
+        factory_type = commodity_map.get(GOODS.resolve(commodity))
         
         if factory_type:
             self.build_factory([factory_type])
         else:
             print(f"Cannot build a factory for '{commodity}'. Try food, electronics, or materials.")
     
-    def process_factory_income(self):
-        """Process factory income (called during travel/time passage)"""
-        if not self.factories:
+    def wait(self, args: List[str]):
+        words = [word for word in args if word not in ('for', 'day', 'days')]
+        if not words:
+            days = 1
+        elif words[0].isdigit():
+            days = int(words[0])
+        else:
+            print("Wait how long? Try 'wait 5' or 'dock for 10 days'.")
+            return
+        if days < 1:
+            print("Time only moves forward, Captain.")
+            return
+        if days > MAX_WAIT_DAYS:
+            print(f"That's longer than your crew will sit still. "
+                  f"Wait at most {MAX_WAIT_DAYS:,} days at a time.")
+            return
+        
+        print(f"⏳ You stay docked at {self.current_location_obj.name} for {days} day(s).")
+        self.advance_time(days)
+        print(f"It is now day {self.state.days_elapsed}.")
+    
+    def advance_time(self, days: int):
+        """Let `days` days pass at once
+        
+        Factory income and loan interest are settled in closed form and markets
+        jump straight to the new day, so the cost grows with factories and
+        loans rather than days.
+        """
+        if days <= 0:
+            return
+        if days > MAX_WAIT_DAYS:
+            raise ValueError(f"Cannot advance {days:,} days at once (at most {MAX_WAIT_DAYS:,})")
+        end = self.state.days_elapsed + days
+        # Markets go stale as time passes; they are recomputed when next read
+        self.state.days_elapsed = end
+        MARKET.advance_to(end)
+        self.accrue_loan_interest(days)
+        if self.factories:
+            self.process_factory_income(days)
+    
+    def accrue_loan_interest(self, days: int):
+        """Compound every loan balance daily for `days` days"""
+        for loan in self.business_loans:
+            loan['remaining'] *= (1 + loan['interest'] / LOAN_RATE_PERIOD_DAYS) ** days
+    
+    def process_factory_income(self, days: int = 1):
+        """Process factory income for `days` days (called during travel/time passage)"""
+        if not self.factories or days <= 0:
             return
         
         total_income = 0
         for location_id, factory in self.factories.items():
             daily_income = factory['income']
-            total_income += daily_income
-            factory['days_active'] += 1
+            total_income += daily_income * days
+            factory['days_active'] += days
         
         if total_income > 0:
             self.state.talents += total_income
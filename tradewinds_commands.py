@@ -0,0 +1,172 @@
+"""
+TradeWinds Command Registry
+Every verb and alias mapped to its handler in one table
+"""
+
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Dict, Hashable, Iterable, Iterator, List, Optional, Tuple
+
+# Parsed command lines kept per game, keyed on the raw text
+PARSE_CACHE_SIZE = 256
+
+# Quantity words in "buy all food" / "sell some water"
+QUANTITY_ALL = -1
+QUANTITY_SOME = -2
+QUANTITY_WORDS = {'some': QUANTITY_SOME, 'all': QUANTITY_ALL}
+
+
+@dataclass(frozen=True)
+class Command:
+    """A registered command: its main verb, aliases and handler
+
+    `takes` names the resolver its argument is looked up with (e.g.
+    'commodity'); `counted` commands read a leading quantity first.
+    """
+    name: str
+    handler: 'Handler'
+    aliases: Tuple[str, ...] = ()
+    module: str = 'core'
+    takes: Optional[str] = None
+    counted: bool = False
+
+
+@dataclass(frozen=True)
+class ParsedCommand:
+    """One command line, split, matched to its command and its argument resolved"""
+    text: str
+    verb: str
+    args: Tuple[str, ...] = ()
+    command: Optional[Command] = None
+    quantity: Optional[int] = None  # A count, QUANTITY_ALL, QUANTITY_SOME, or None if not given
+    subject: str = ''               # The argument without its quantity
+    target: Optional[str] = None    # The subject resolved to an id, for commands that take one
+
+    @property
+    def rest(self) -> str:
+        """Everything after the verb"""
+        return ' '.join(self.args)
+
+
+# Handlers get the parsed command line
+Handler = Callable[[ParsedCommand], None]
+
+
+class CommandRegistry:
+    """Verb -> Command table shared by every command module
+
+    A command module is any function taking (registry, game) that registers
+    its commands; modules can be removed again by name. Dispatch is one dict
+    lookup however many verbs are registered. A verb belongs to exactly one
+    command, so registering it twice is an error. `version` changes with
+    every registration or removal, for caches built on the vocabulary.
+    """
+
+    def __init__(self):
+        self._verbs: Dict[str, Command] = {}
+        self._modules: Dict[str, List[Command]] = {}
+        self.version = 0
+
+    def register(self, name: str, handler: Handler, aliases: Iterable[str] = (),
+                 module: str = 'core', takes: Optional[str] = None, counted: bool = False) -> Command:
+        command = Command(name, handler, tuple(alias for alias in aliases if alias != name), module,
+                          takes, counted)
+        for verb in (name,) + command.aliases:
+            if verb in self._verbs:
+                raise ValueError(f"Verb '{verb}' is already registered by '{self._verbs[verb].name}'")
+        for verb in (name,) + command.aliases:
+            self._verbs[verb] = command
+        self._modules.setdefault(module, []).append(command)
+        self.version += 1
+        return command
+
+    def remove_module(self, module: str):
+        """Unregister every command a module added"""
+        for command in self._modules.pop(module, []):
+            for verb in (command.name,) + command.aliases:
+                del self._verbs[verb]
+            self.version += 1
+
+    def get(self, verb: str) -> Optional[Command]:
+        return self._verbs.get(verb)
+
+    def dispatch(self, parsed: ParsedCommand) -> bool:
+        """Run a parsed command line; False if no command has its verb"""
+        if parsed.command is None:
+            return False
+        parsed.command.handler(parsed)
+        return True
+
+    def __contains__(self, verb: str) -> bool:
+        return verb in self._verbs
+
+    def __iter__(self) -> Iterator[str]:
+        """Every registered verb and alias"""
+        return iter(self._verbs)
+
+    def __len__(self) -> int:
+        return len(self._verbs)
+
+    def modules(self) -> List[str]:
+        return list(self._modules)
+
+
+class CommandParser:
+    """Command lines -> ParsedCommand, through an LRU keyed on the raw text
+
+    Splitting, the verb lookup, quantity words and the argument's resolver
+    run once per distinct line; a repeated line ("market", "sell all food")
+    is a dict hit. Cached parses are dropped whenever the registry's version
+    or `version()` (whatever the resolvers depend on) changes.
+    """
+
+    def __init__(self, registry: CommandRegistry,
+                 resolvers: Optional[Dict[str, Callable[[str], Optional[str]]]] = None,
+                 version: Callable[[], Hashable] = lambda: 0, cache_size: int = PARSE_CACHE_SIZE):
+        self.registry = registry
+        self.resolvers = dict(resolvers or {})
+        self.version = version
+        self.cache_size = cache_size
+        self._parsed: 'OrderedDict[str, ParsedCommand]' = OrderedDict()
+        self._version: Hashable = None
+
+    def parse(self, text: str) -> Optional[ParsedCommand]:
+        """The parsed line, or None if it is blank"""
+        version = (self.registry.version, self.version())
+        if version != self._version:
+            self._parsed.clear()
+            self._version = version
+        parsed = self._parsed.get(text)
+        if parsed is not None:
+            self._parsed.move_to_end(text)
+            return parsed
+        words = text.split()
+        if not words:
+            return None
+        parsed = self._parsed[text] = self._parse(' '.join(words), words[0], tuple(words[1:]))
+        if len(self._parsed) > self.cache_size:
+            self._parsed.popitem(last=False)
+        return parsed
+
+    def _parse(self, text: str, verb: str, args: Tuple[str, ...]) -> ParsedCommand:
+        command = self.registry.get(verb)
+        if command is None:
+            return ParsedCommand(text, verb, args)
+        quantity = None
+        words = list(args)
+        if command.counted and words:
+            if words[0].isdigit():
+                quantity = int(words.pop(0))
+            else:
+                for word, amount in QUANTITY_WORDS.items():
+                    if word in words:
+                        quantity = amount
+                        words.remove(word)
+                        break
+        subject = ' '.join(words)
+        resolve = self.resolvers.get(command.takes)
+        target = resolve(subject) if resolve and subject else None
+        return ParsedCommand(text, verb, args, command, quantity, subject, target)
+
+    def clear(self):
+        self._parsed.clear()
@@ -0,0 +1,79 @@
+"""
+TradeWinds Destination Tables
+Per-location travel lists built once, then filtered by what the player can afford
+"""
+
+from bisect import bisect_right
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Dict, Hashable, List, Tuple
+
+# Locations whose destination tables are kept in memory at once
+DESTINATION_CACHE_SIZE = 64
+
+
+@dataclass(frozen=True)
+class Destination:
+    """One place reachable from a location, already costed out"""
+    id: str
+    travel_time: float
+    fuel_cost: int
+    distance: float = 0.0  # Light years, for the views that show it
+
+
+class DestinationTable:
+    """Destinations from one location in display order
+
+    Fuel costs are also kept sorted, so the number of affordable destinations
+    is a bisection. Every wallet between two neighbouring costs sees the same
+    list, so the (destination, affordable) rows are memoized per such bucket.
+    """
+
+    def __init__(self, entries: List[Destination]):
+        self.entries = entries
+        self.costs = sorted(entry.fuel_cost for entry in entries)
+        self._views: Dict[int, List[Tuple[Destination, bool]]] = {}
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def affordable_count(self, talents: float) -> int:
+        return bisect_right(self.costs, talents)
+
+    def view(self, talents: float) -> List[Tuple[Destination, bool]]:
+        """Every destination with whether its fuel is affordable, in display order"""
+        bucket = self.affordable_count(talents)
+        rows = self._views.get(bucket)
+        if rows is None:
+            rows = self._views[bucket] = [(entry, entry.fuel_cost <= talents) for entry in self.entries]
+        return rows
+
+
+class DestinationCache:
+    """LRU of destination tables keyed by (location, version)
+
+    `build` costs out and sorts a location's destinations; `version` returns
+    whatever they depend on (e.g. the world's graph_version and the fuel
+    formula), so a table is only rebuilt after one of those changes.
+    """
+
+    def __init__(self, build: Callable[[str], List[Destination]], version: Callable[[], Hashable] = lambda: 0,
+                 cache_size: int = DESTINATION_CACHE_SIZE):
+        self.build = build
+        self.version = version
+        self.cache_size = cache_size
+        self._tables: 'OrderedDict[Tuple[str, Hashable], DestinationTable]' = OrderedDict()
+
+    def table(self, location_id: str) -> DestinationTable:
+        key = (location_id, self.version())
+        table = self._tables.get(key)
+        if table is None:
+            table = self._tables[key] = DestinationTable(self.build(location_id))
+            if len(self._tables) > self.cache_size:
+                self._tables.popitem(last=False)
+        else:
+            self._tables.move_to_end(key)
+        return table
+
+    def clear(self):
+        self._tables.clear()
@@ -0,0 +1,326 @@
+"""
+TradeWinds Galaxy Generator
+Seeded procedural galaxies streamed to JSON lines, and a loader into a WorldStore
+"""
+
+import argparse
+import json
+import time
+from dataclasses import asdict
+from typing import Dict, Iterator, List, Optional
+
+import numpy as np
+
+from tradewinds_spatial import SpatialIndex
+from tradewinds_world import LOCATION_TEXT, CommodityRecord, TextStore, WorldStore
+
+# Named sizes for benchmarks: stations, systems
+PRESETS = {
+    '1k': (1_000, 100),
+    '10k': (10_000, 1_000),
+    '100k': (100_000, 10_000),
+}
+DEFAULT_SEED = 42
+
+# Average light years between neighbouring systems; the galaxy grows to keep it
+SYSTEM_SPACING = 6.0
+
+# Stations of one system sit within this many light years of its star
+STATION_SPREAD = 0.001
+
+# Lanes from every system to its nearest neighbours (made symmetric)
+SYSTEM_LINKS = 3
+
+# Extra lanes inside a system, on top of a ring through its stations
+INTRA_SYSTEM_CHORDS = 1
+
+# Travel time: proportional to distance, but no jump is quicker than MIN_JUMP_DAYS
+DAYS_PER_LIGHT_YEAR = 0.75
+MIN_JUMP_DAYS = 0.5
+
+# Goods each station makes and needs
+PRODUCES_PER_STATION = (1, 3)
+CONSUMES_PER_STATION = (1, 3)
+
+NAME_PREFIXES = ["Ka", "Vel", "Or", "Thes", "Mir", "Dra", "Ul", "Zen", "Cor", "Ash", "Ny", "Bel", "Tor", "Ix", "Sa", "Quel"]
+NAME_SUFFIXES = ["ris", "ath", "on", "ara", "ex", "ion", "uma", "eth", "is", "ora", "an", "yx"]
+
+STATION_KINDS = ["Station", "Colony", "Outpost", "Refinery", "Shipyard", "Habitat", "Mining Camp", "Research Base"]
+
+SHORT_TEMPLATES = [
+    "A {kind_lower} trading in {produces}",
+    "A busy {kind_lower} on the {system} lanes",
+    "A remote {kind_lower} hungry for {consumes}",
+]
+LONG_TEMPLATES = [
+    "{name} turns slowly above a world of the {system} system. Its docks ship {produces} "
+    "to anyone who can pay, and its buyers pay well for {consumes}.",
+    "Freighters queue outside {name}, the largest {kind_lower} in the {system} system. "
+    "Cargo bays overflow with {produces}, while the quartermasters post standing orders for {consumes}.",
+    "Few charts mark {name}, a {kind_lower} at the edge of the {system} system. "
+    "It lives on exports of {produces} and imports of {consumes}.",
+]
+ATMOSPHERES = [
+    "The air smells of machine oil and recycled water.",
+    "Station chimes echo through corridors that never sleep.",
+    "A faint hum of reactors runs beneath every conversation.",
+    "Cold light from the nearby star filters through frosted viewports.",
+]
+
+
+def _system_names(count: int, rng: np.random.Generator) -> List[str]:
+    """Unique pronounceable names ("Velora 12")"""
+    prefixes = rng.integers(len(NAME_PREFIXES), size=count)
+    suffixes = rng.integers(len(NAME_SUFFIXES), size=count)
+    return [f"{NAME_PREFIXES[p]}{NAME_SUFFIXES[s]} {i}" for i, (p, s) in enumerate(zip(prefixes.tolist(), suffixes.tolist()))]
+
+
+def _slug(text: str) -> str:
+    return "".join(c if c.isalnum() else "_" for c in text.lower())
+
+
+def _jump_days(a: np.ndarray, b: np.ndarray) -> float:
+    return round(max(MIN_JUMP_DAYS, float(np.linalg.norm(a - b)) * DAYS_PER_LIGHT_YEAR), 1)
+
+
+def _system_lanes(centers: np.ndarray) -> List[set]:
+    """Symmetric system links: nearest neighbours, then joins until every system is reachable"""
+    count = len(centers)
+    ids = [str(i) for i in range(count)]
+    index = SpatialIndex(centers, ids)
+    links = [set() for _ in range(count)]
+    for system in range(count):
+        for other, _ in index.nearest(centers[system], SYSTEM_LINKS, exclude=[ids[system]]):
+            links[system].add(int(other))
+            links[int(other)].add(system)
+
+    # Union-find over the links; each stray cluster is joined to its nearest outside system
+    parent = list(range(count))
+
+    def find(x: int) -> int:
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    for system in range(count):
+        for other in links[system]:
+            parent[find(system)] = find(other)
+    while True:
+        roots = {}
+        for system in range(count):
+            roots.setdefault(find(system), system)
+        if len(roots) == 1:
+            return links
+        for root, system in roots.items():
+            if find(system) != root:
+                continue  # Already joined this round
+            k = SYSTEM_LINKS + 1
+            while True:
+                outside = [int(o) for o, _ in index.nearest(centers[system], k) if find(int(o)) != root]
+                if outside or k >= count:
+                    break
+                k *= 2
+            if not outside:
+                break  # Earlier joins this round connected everything
+            links[system].add(outside[0])
+            links[outside[0]].add(system)
+            parent[root] = find(outside[0])
+
+
+def generate_galaxy(stations: int, systems: int, commodities: Dict[str, CommodityRecord],
+                    seed: int = DEFAULT_SEED) -> Iterator[dict]:
+    """Records of a procedural galaxy: a header, then one station at a time
+
+    The same (stations, systems, commodities, seed) always yields the same
+    galaxy. Coordinates are light years with Earth at the origin; each
+    system's stations form a ring of short jumps, and each system's first
+    station is its hub with lanes to the hubs of nearby systems.
+    """
+    if systems < 1 or stations < systems:
+        raise ValueError("Need at least one system and one station per system")
+    rng = np.random.default_rng(seed)
+    commodity_ids = list(commodities)
+
+    # Uniform density in a ball sized for SYSTEM_SPACING between neighbours
+    radius = SYSTEM_SPACING * (systems / (4 / 3 * np.pi)) ** (1 / 3)
+    direction = rng.normal(size=(systems, 3))
+    direction /= np.linalg.norm(direction, axis=1, keepdims=True)
+    centers = direction * (radius * rng.random(systems) ** (1 / 3))[:, None]
+    system_names = _system_names(systems, rng)
+
+    # One station per system, the rest scattered
+    per_system = np.ones(systems, dtype=np.int64) + np.bincount(
+        rng.integers(systems, size=stations - systems), minlength=systems)
+    first = np.concatenate([[0], np.cumsum(per_system)[:-1]])
+    kinds = rng.integers(len(STATION_KINDS), size=stations)
+    positions = np.repeat(centers, per_system, axis=0) + rng.normal(scale=STATION_SPREAD, size=(stations, 3))
+    positions[first] = centers[np.arange(systems)]
+    names = []
+    for system in range(systems):
+        for k in range(per_system[system]):
+            row = first[system] + k
+            names.append(f"{system_names[system]} {STATION_KINDS[kinds[row]]} {k + 1}")
+    ids = [_slug(name) for name in names]
+    links = _system_lanes(centers)
+
+    yield {
+        'galaxy': {'seed': seed, 'stations': stations, 'systems': systems},
+        'commodities': {cid: asdict(record) for cid, record in commodities.items()},
+    }
+
+    for system in range(systems):
+        start, count = int(first[system]), int(per_system[system])
+        rows = range(start, start + count)
+        lanes: Dict[int, Dict[str, float]] = {row: {} for row in rows}
+        if count > 1:
+            for k in range(count):
+                a, b = start + k, start + (k + 1) % count
+                lanes[a][ids[b]] = lanes[b][ids[a]] = _jump_days(positions[a], positions[b])
+            for _ in range(INTRA_SYSTEM_CHORDS):
+                a, b = (start + rng.integers(count, size=2)).tolist()
+                if a != b:
+                    lanes[a][ids[b]] = lanes[b][ids[a]] = _jump_days(positions[a], positions[b])
+        for other in sorted(links[system]):
+            hub = int(first[other])
+            lanes[start][ids[hub]] = _jump_days(positions[start], positions[hub])
+
+        for row in rows:
+            picks = rng.permutation(len(commodity_ids))
+            n_make = int(rng.integers(PRODUCES_PER_STATION[0], PRODUCES_PER_STATION[1] + 1))
+            n_need = int(rng.integers(CONSUMES_PER_STATION[0], CONSUMES_PER_STATION[1] + 1))
+            produces = [commodity_ids[i] for i in sorted(picks[:n_make].tolist())]
+            consumes = [commodity_ids[i] for i in sorted(picks[n_make:n_make + n_need].tolist())]
+            words = {
+                'name': names[row], 'system': system_names[system],
+                'kind_lower': STATION_KINDS[kinds[row]].lower(),
+                'produces': ", ".join(commodities[c].name for c in produces),
+                'consumes': ", ".join(commodities[c].name for c in consumes),
+            }
+            yield {
+                'id': ids[row], 'name': names[row], 'system': system_names[system],
+                'position': [round(float(x), 6) for x in positions[row]],
+                'distance_from_earth': round(float(np.linalg.norm(positions[row])), 3),
+                'produces': produces, 'consumes': consumes,
+                'connections': lanes[row],
+                'short_desc': SHORT_TEMPLATES[int(rng.integers(len(SHORT_TEMPLATES)))].format(**words),
+                'long_desc': LONG_TEMPLATES[int(rng.integers(len(LONG_TEMPLATES)))].format(**words),
+                'atmosphere': ATMOSPHERES[int(rng.integers(len(ATMOSPHERES)))],
+            }
+
+
+def write_galaxy(path: str, stations: int, systems: int, commodities: Dict[str, CommodityRecord],
+                 seed: int = DEFAULT_SEED):
+    """Stream a generated galaxy to a JSON lines file, one record per line"""
+    with open(path, 'w', encoding='utf-8') as out:
+        for record in generate_galaxy(stations, systems, commodities, seed):
+            out.write(json.dumps(record, separators=(',', ':')))
+            out.write('\n')
+
+
+def load_galaxy(path: str) -> WorldStore:
+    """WorldStore from a galaxy file; descriptions stay on disk and are read by byte offset when shown"""
+    offsets: List[int] = []
+    ids, names, systems, distance, positions = [], [], [], [], []
+    produces, consumes, routes = [], [], []
+    with open(path, 'rb') as source:
+        header = json.loads(source.readline())
+        commodities = {cid: CommodityRecord(**fields) for cid, fields in header['commodities'].items()}
+        commodity_index = {cid: i for i, cid in enumerate(commodities)}
+        while True:
+            offset = source.tell()
+            line = source.readline()
+            if not line:
+                break
+            record = json.loads(line)
+            offsets.append(offset)
+            ids.append(record['id'])
+            names.append(record['name'])
+            systems.append(record['system'])
+            distance.append(record['distance_from_earth'])
+            positions.append(record['position'])
+            produces.append([commodity_index[c] for c in record['produces']])
+            consumes.append([commodity_index[c] for c in record['consumes']])
+            routes.extend((record['id'], dest, days) for dest, days in record['connections'].items())
+
+    def read_text(row: int) -> Dict[str, str]:
+        with open(path, 'rb') as source:
+            source.seek(offsets[row])
+            record = json.loads(source.readline())
+        return {name: record[name] for name in LOCATION_TEXT}
+
+    def mask(columns: List[List[int]]) -> np.ndarray:
+        out = np.zeros((len(columns), len(commodities)), dtype=bool)
+        rows = np.repeat(np.arange(len(columns)), [len(c) for c in columns])
+        out[rows, [c for cs in columns for c in cs]] = True
+        return out
+
+    world = WorldStore(
+        commodities, [c.name for c in commodities.values()],
+        [c.base_price for c in commodities.values()],
+        [c.volatility for c in commodities.values()],
+        [c.elasticity for c in commodities.values()],
+        ids, names, systems, distance, mask(produces), mask(consumes),
+        location_text=TextStore(LOCATION_TEXT, loader=read_text), positions=positions
+    )
+    for row, commodity in enumerate(commodities.values()):
+        world.commodity_text.put(row, {'description': commodity.description})
+    world.add_routes(routes)
+    return world
+
+
+def benchmark(world: WorldStore, queries: int = 100, seed: int = DEFAULT_SEED):
+    """Time pricing, routing and description rendering on a loaded world"""
+    from tradewinds_market import MarketEngine
+    from tradewinds_routes import RoutePlanner
+
+    rng = np.random.default_rng(seed)
+    rows = rng.integers(len(world.location_ids), size=(queries, 2)).tolist()
+
+    def timed(label: str, work):
+        start = time.perf_counter()
+        work()
+        print(f"  {label:<32} {(time.perf_counter() - start) * 1000:9.1f} ms")
+
+    print(f"🌌 {len(world.location_ids):,} stations in {len(world.system_names):,} systems, "
+          f"{sum(len(lanes) for lanes in world.adjacency):,} lanes, {world.nbytes / 1e6:.1f} MB of columns")
+    market = MarketEngine.from_world(world)
+    timed("market: every price", market.materialize)
+    timed("market: advance 30 days", lambda: (market.advance_to(30), market.materialize()))
+    planner = RoutePlanner(world, lambda days: max(10, int(days * 25)))
+    ids = world.location_ids
+    timed(f"routes: {queries} one-off queries", lambda: [planner.route(ids[a], ids[b]) for a, b in rows])
+    timed(f"text: {queries} descriptions", lambda: [world.locations[ids[a]].long_desc for a, _ in rows])
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Generate a reproducible TradeWinds galaxy as JSON lines")
+    parser.add_argument('size', nargs='?', choices=sorted(PRESETS), help="preset size (stations)")
+    parser.add_argument('--stations', type=int, help="number of stations (overrides the preset)")
+    parser.add_argument('--systems', type=int, help="number of star systems (overrides the preset)")
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED)
+    parser.add_argument('-o', '--output', help="file to write (default galaxy_<stations>.jsonl)")
+    parser.add_argument('--bench', action='store_true', help="load the galaxy afterwards and time the engine on it")
+    args = parser.parse_args(argv)
+
+    stations, systems = PRESETS[args.size or '1k']
+    if args.stations:
+        stations, systems = args.stations, max(1, args.stations // 10)
+    systems = args.systems or systems
+    output = args.output or f"galaxy_{stations}.jsonl"
+
+    from tradewinds_adventure import COMMODITY_DATA
+    start = time.perf_counter()
+    write_galaxy(output, stations, systems, COMMODITY_DATA, args.seed)
+    print(f"✨ Wrote {stations:,} stations in {systems:,} systems to {output} "
+          f"({time.perf_counter() - start:.1f}s, seed {args.seed})")
+
+    if args.bench:
+        start = time.perf_counter()
+        world = load_galaxy(output)
+        print(f"📂 Loaded in {time.perf_counter() - start:.1f}s")
+        benchmark(world)
+
+
+if __name__ == "__main__":
+    main()
@@ -5,21 +5,21 @@ A space trading game with real star systems
 
 import tkinter as tk
 from tkinter import ttk, messagebox, simpledialog
-import random
+import math
 from typing import Dict, List
 import json
 
+from tradewinds_market import MarketEngine, MarketView
+from tradewinds_destinations import Destination, DestinationCache
+from tradewinds_spatial import SpatialIndex, system_position
+
 # Game Data Classes (same as CLI version)
 class Commodity:
-    def __init__(self, name: str, base_price: int, volatility: float):
+    def __init__(self, name: str, base_price: int, volatility: float, elasticity: float = 0.005):
         self.name = name
         self.base_price = base_price
         self.volatility = volatility
-    
-    def get_market_price(self, supply_demand: float) -> int:
-        variation = random.uniform(-self.volatility, self.volatility)
-        price = self.base_price * (1 + variation) * supply_demand
-        return max(1, int(price))
+        self.elasticity = elasticity
 
 class Location:
     def __init__(self, name: str, system: str, description: str, 
@@ -31,21 +31,14 @@ class Location:
         self.produces = produces or []
         self.consumes = consumes or []
         self.distance_from_earth = distance_from_earth
-        
-        self.market_prices: Dict[str, int] = {}
-        self._generate_market_prices()
+        self.position = system_position(system, distance_from_earth)
+    
+    @property
+    def market_prices(self) -> MarketView:
+        return MARKET.view(self.name)
     
     def _generate_market_prices(self):
-        for commodity_name, commodity in COMMODITIES.items():
-            supply_demand = 1.0
-            if commodity_name in self.produces:
-                supply_demand = random.uniform(0.6, 0.8)
-            elif commodity_name in self.consumes:
-                supply_demand = random.uniform(1.2, 1.6)
-            else:
-                supply_demand = random.uniform(0.9, 1.1)
-            
-            self.market_prices[commodity_name] = commodity.get_market_price(supply_demand)
+        MARKET.regenerate([self.name])
     
     def refresh_market(self):
         self._generate_market_prices()
@@ -54,7 +47,7 @@ class Location:
         if self.system == other_location.system:
             return 0.1
         else:
-            return abs(self.distance_from_earth - other_location.distance_from_earth) + 1
+            return math.dist(self.position, other_location.position)
 
 class Player:
     def __init__(self, name: str):
@@ -172,6 +165,27 @@ LOCATIONS = {
     )
 }
 
+# All market prices live in one galaxy-wide matrix, filled in lazily
+MARKET = MarketEngine.from_catalog(COMMODITIES, LOCATIONS, price_impact=True)
+
+# Nearest-neighbour index over every location's position
+SPATIAL = SpatialIndex([loc.position for loc in LOCATIONS.values()], list(LOCATIONS))
+
+# Destinations shown in the travel tab, closest first
+DESTINATION_LIMIT = 20
+
+def nearest_destinations(location_name: str) -> List[Destination]:
+    """The closest DESTINATION_LIMIT locations with their fuel costs (positions never move)"""
+    origin = LOCATIONS[location_name]
+    destinations = []
+    for loc_name, _ in SPATIAL.nearest(origin.position, DESTINATION_LIMIT, exclude=[location_name]):
+        distance = origin.get_distance_to(LOCATIONS[loc_name])
+        destinations.append(Destination(loc_name, max(1, int(distance)), max(10, int(distance * 5)), distance))
+    return destinations
+
+# Travel tab tables per location, reused on every refresh
+DESTINATIONS = DestinationCache(nearest_destinations)
+
 class TradeWindsGUI:
     def __init__(self, root):
         self.root = root
@@ -528,7 +542,7 @@ class TradeWindsGUI:
                                 font=('Helvetica', 12, 'bold'))
             name_label.pack(anchor='w')
             
-            price_text = f"Price: {price} credits"
+            price_text = f"Price: {price} credits | Stock: {MARKET.available(self.current_location.name, commodity_name)}"
             if commodity_name in self.current_location.produces:
                 price_text += " 📉 (Cheap)"
                 price_color = '#4ecdc4'
@@ -556,7 +570,7 @@ class TradeWindsGUI:
             button_frame.pack(side='right', padx=10, pady=10)
             
             if mode == 'buy':
-                max_affordable = self.player.credits // price
+                max_affordable = MARKET.max_affordable(self.current_location.name, commodity_name, self.player.credits)
                 max_space = self.player.get_cargo_space()
                 max_buyable = min(max_affordable, max_space)
                 
@@ -595,17 +609,11 @@ class TradeWindsGUI:
         for widget in self.travel_scrollable_frame.winfo_children():
             widget.destroy()
         
-        destinations = []
-        for loc_name, location in LOCATIONS.items():
-            if loc_name != self.current_location.name:
-                distance = self.current_location.get_distance_to(location)
-                fuel_cost = max(10, int(distance * 5))
-                destinations.append((loc_name, location, distance, fuel_cost))
-        
-        # Sort by distance
-        destinations.sort(key=lambda x: x[2])
-        
-        for loc_name, location, distance, fuel_cost in destinations:
+        table = DESTINATIONS.table(self.current_location.name)
+        for dest, affordable in table.view(self.player.credits):
+            loc_name, location = dest.id, LOCATIONS[dest.id]
+            distance, fuel_cost = dest.distance, dest.fuel_cost
+
             dest_frame = tk.Frame(self.travel_scrollable_frame, bg='#2d1b4e', relief='ridge', bd=1)
             dest_frame.pack(fill='x', padx=5, pady=5)
             
@@ -637,7 +645,7 @@ class TradeWindsGUI:
             button_frame = tk.Frame(dest_frame, bg='#2d1b4e')
             button_frame.pack(side='right', padx=15, pady=15)
             
-            if self.player.credits >= fuel_cost:
+            if affordable:
                 travel_btn = tk.Button(button_frame, text="🚀 Travel Here",
                                      bg='#00d4ff', fg='white', 
                                      font=('Helvetica', 12, 'bold'),
@@ -651,13 +659,14 @@ class TradeWindsGUI:
                 disabled_btn.pack()
     
     def buy_commodity(self, commodity_name):
+        location_name = self.current_location.name
         price = self.current_location.market_prices[commodity_name]
-        max_affordable = self.player.credits // price
+        max_affordable = MARKET.max_affordable(location_name, commodity_name, self.player.credits)
         max_space = self.player.get_cargo_space()
         max_buyable = min(max_affordable, max_space)
         
         if max_buyable <= 0:
-            messagebox.showerror("Can't Buy", "Not enough credits or cargo space!")
+            messagebox.showerror("Can't Buy", "Not enough credits, stock or cargo space!")
             return
         
         quantity = simpledialog.askinteger(
@@ -667,9 +676,10 @@ class TradeWindsGUI:
         )
         
         if quantity:
-            total_cost = price * quantity
+            total_cost = MARKET.buy_quote(location_name, commodity_name, quantity)
             if self.player.spend_credits(total_cost):
                 if self.player.add_cargo(commodity_name, quantity):
+                    MARKET.execute_trade(location_name, commodity_name, quantity)
                     messagebox.showinfo("Success!", f"Bought {quantity} {commodity_name} for {total_cost:,} credits!")
                     self.update_display()
                 else:
@@ -693,8 +703,10 @@ class TradeWindsGUI:
         )
         
         if quantity:
+            location_name = self.current_location.name
+            total_earned = MARKET.sell_quote(location_name, commodity_name, quantity)
             if self.player.remove_cargo(commodity_name, quantity):
-                total_earned = price * quantity
+                MARKET.execute_trade(location_name, commodity_name, -quantity)
                 self.player.add_credits(total_earned)
                 messagebox.showinfo("Success!", f"Sold {quantity} {commodity_name} for {total_earned:,} credits!")
                 self.update_display()
@@ -716,8 +728,8 @@ class TradeWindsGUI:
         self.player.days_elapsed += travel_time
         self.current_location = new_location
         
-        # Refresh market at new location
-        self.current_location.refresh_market()
+        # Markets go stale as time passes; they are recomputed when next read
+        MARKET.advance_to(self.player.days_elapsed)
         
         messagebox.showinfo("Travel Complete!", 
                           f"🚀 Traveled to {destination_name}!\n"
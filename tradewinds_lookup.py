@@ -0,0 +1,383 @@
+"""
+TradeWinds Name Lookup
+Free-text place and commodity names resolved to ids, with spelling suggestions
+"""
+
+import re
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+# Words dropped from queries ("go to the mars colony")
+STOPWORDS = frozenset({'to', 'the', 'a', 'an', 'at', 'for', 'on', 'of', 'towards', 'toward', 'into', 'my', 'some'})
+
+# How much a match on each kind of text counts; aliases and ids beat names, names beat systems
+ALIAS_WEIGHT = 4
+ID_WEIGHT = 4
+NAME_WEIGHT = 3
+SYSTEM_WEIGHT = 2
+
+# Kinds of commodity match, strongest first
+MATCH_EXACT, MATCH_NUMBER, MATCH_WORD, MATCH_PREFIX, MATCH_WORD_PREFIX = range(5)
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text: str) -> List[str]:
+    """Lower-case alphanumeric words ("Kepler-452b" is "kepler", "452b")"""
+    return _TOKEN.findall(text.lower())
+
+
+class _Node:
+    __slots__ = ('children', 'quality', 'ranked')
+
+    def __init__(self):
+        self.children: Dict[str, '_Node'] = {}
+        self.quality: Dict[int, int] = {}  # Key slot -> best match quality of any token through here
+        self.ranked: Optional[List[int]] = None  # Slots best first, built on first query
+
+
+class NameIndex:
+    """Keys (ids) found by any word, or the start of any word, of their names
+
+    Every word of every name is threaded through one prefix trie. Each
+    node remembers, per key, its best match quality there: the weight of
+    the text the word came from, doubled, plus one if the word ends at that
+    node (an exact word beats a prefix). A one-word query is a walk down the
+    trie and a look at that node's ranking; longer queries keep the keys
+    every known word matches, falling back to the keys matching most words.
+    Ties go to the key added first, so answers never depend on dict order.
+    """
+
+    def __init__(self, stopwords: Iterable[str] = STOPWORDS):
+        self.stopwords = frozenset(stopwords)
+        self.keys: List[str] = []
+        self._slot: Dict[str, int] = {}
+        self._root = _Node()
+        # Bumped whenever a name is added, so caches of resolved text know to drop it
+        self.version = 0
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def add(self, key: str, text: str, weight: int):
+        """Make `key` findable by the words of `text`"""
+        self.version += 1
+        slot = self._slot.get(key)
+        if slot is None:
+            slot = self._slot[key] = len(self.keys)
+            self.keys.append(key)
+        for word in tokenize(text):
+            node = self._root
+            for depth, char in enumerate(word, 1):
+                node = node.children.setdefault(char, _Node())
+                quality = 2 * weight + (depth == len(word))
+                if quality > node.quality.get(slot, 0):
+                    node.quality[slot] = quality
+                    node.ranked = None
+
+    def _find(self, word: str) -> Optional[_Node]:
+        node = self._root
+        for char in word:
+            node = node.children.get(char)
+            if node is None:
+                return None
+        return node
+
+    def _ranked(self, node: _Node) -> List[int]:
+        if node.ranked is None:
+            node.ranked = sorted(node.quality, key=lambda slot: (-node.quality[slot], slot))
+        return node.ranked
+
+    def _query_nodes(self, query: str) -> List[_Node]:
+        words = tokenize(query)
+        words = [word for word in words if word not in self.stopwords] or words
+        return [node for node in map(self._find, words) if node is not None and node.quality]
+
+    def matches(self, query: str, limit: Optional[int] = None) -> List[str]:
+        """Keys matching the query, best first"""
+        nodes = self._query_nodes(query)
+        if not nodes:
+            return []
+        if len(nodes) == 1:
+            ranked = self._ranked(nodes[0])
+            return [self.keys[slot] for slot in ranked[:limit]]
+
+        # Keys every word matches, scanning the smallest candidate set
+        nodes.sort(key=lambda node: len(node.quality))
+        scored: List[Tuple[int, int, int]] = []
+        for slot, quality in nodes[0].quality.items():
+            total = quality
+            for node in nodes[1:]:
+                other = node.quality.get(slot)
+                if other is None:
+                    break
+                total += other
+            else:
+                scored.append((-total, slot, len(nodes)))
+        if not scored:
+            # Nothing matches every word: prefer keys matching the most words
+            totals: Dict[int, List[int]] = {}
+            for node in nodes:
+                for slot, quality in node.quality.items():
+                    entry = totals.setdefault(slot, [0, 0])
+                    entry[0] += 1
+                    entry[1] += quality
+            scored = [(-total, slot, count) for slot, (count, total) in totals.items()]
+            scored.sort(key=lambda entry: (-entry[2], entry[0], entry[1]))
+        else:
+            scored.sort()
+        return [self.keys[slot] for _, slot, _ in scored[:limit]]
+
+    def resolve(self, query: str) -> Optional[str]:
+        """Best key for the query, or None"""
+        found = self.matches(query, limit=1)
+        return found[0] if found else None
+
+
+class DestinationResolver(NameIndex):
+    """Locations found by name, system, id or alias ("mars", "kepler 452b", "sol")"""
+
+    def __init__(self, ids: Sequence[str], names: Sequence[str], systems: Sequence[str],
+                 aliases: Optional[Dict[str, str]] = None, stopwords: Iterable[str] = STOPWORDS):
+        super().__init__(stopwords)
+        for location_id, name, system in zip(ids, names, systems):
+            self.add(location_id, location_id.replace('_', ' '), ID_WEIGHT)
+            self.add(location_id, name, NAME_WEIGHT)
+            self.add(location_id, system, SYSTEM_WEIGHT)
+        for alias, location_id in (aliases or {}).items():
+            self.add(location_id, alias, ALIAS_WEIGHT)
+
+    @classmethod
+    def from_world(cls, world, aliases: Optional[Dict[str, str]] = None) -> 'DestinationResolver':
+        systems = [world.system_names[system] for system in world.system_id.tolist()]
+        return cls(world.location_ids, world.location_names, systems, aliases)
+
+
+def _number_variants(word: str) -> List[str]:
+    """Singular and plural spellings of a word ("metals" <-> "metal", "batteries" <-> "battery")"""
+    if word.endswith('ies') and len(word) > 3:
+        return [word[:-3] + 'y']
+    if word.endswith(('ches', 'shes', 'sses', 'xes')):
+        return [word[:-2]]
+    if word.endswith('s') and not word.endswith('ss'):
+        return [word[:-1]]
+    if word.endswith('y') and len(word) > 1 and word[-2] not in 'aeiou':
+        return [word[:-1] + 'ies']
+    if word.endswith(('ch', 'sh', 'ss', 'x')):
+        return [word + 'es']
+    return [word + 's']
+
+
+class CommodityResolver:
+    """Commodity ids by id, name, singular/plural spelling, word or prefix
+
+    Every string that should find a commodity is put in one dict up front,
+    so a lookup is a normalization and a single dict probe however large
+    the catalogue. Where strings clash the stronger kind of match wins
+    (exact id or name, then the other number, then one word of the name,
+    then prefixes), and then the commodity listed first.
+    """
+
+    def __init__(self, ids: Sequence[str], names: Sequence[str], stopwords: Iterable[str] = STOPWORDS):
+        self.stopwords = frozenset(stopwords)
+        self._best: Dict[str, Tuple[int, int, str]] = {}  # text -> (match kind, catalogue order, id)
+        # Bumped whenever an answer changes, so caches of resolved text know to drop it
+        self.version = 0
+        for order, (commodity_id, name) in enumerate(zip(ids, names)):
+            for text in {self.normalize(commodity_id.replace('_', ' ')), self.normalize(name)}:
+                self._offer(text, MATCH_EXACT, order, commodity_id)
+                words = text.split()
+                for variant in _number_variants(words[-1]):
+                    self._offer(' '.join(words[:-1] + [variant]), MATCH_NUMBER, order, commodity_id)
+                if len(words) > 1:
+                    for word in words:
+                        self._offer(word, MATCH_WORD, order, commodity_id)
+                        for variant in _number_variants(word):
+                            self._offer(variant, MATCH_WORD, order, commodity_id)
+                        for end in range(1, len(word)):
+                            self._offer(word[:end], MATCH_WORD_PREFIX, order, commodity_id)
+                for end in range(1, len(text)):
+                    self._offer(text[:end].rstrip(), MATCH_PREFIX, order, commodity_id)
+
+    @classmethod
+    def from_world(cls, world) -> 'CommodityResolver':
+        return cls(world.commodity_ids, world.commodity_names)
+
+    def normalize(self, text: str) -> str:
+        words = tokenize(text)
+        return ' '.join([word for word in words if word not in self.stopwords] or words)
+
+    def _offer(self, text: str, kind: int, order: int, commodity_id: str):
+        if text and (kind, order) < self._best.get(text, (kind + 1, order))[:2]:
+            self._best[text] = (kind, order, commodity_id)
+            self.version += 1
+
+    def resolve(self, text: str) -> Optional[str]:
+        """Commodity id for what the player typed, or None"""
+        found = self._best.get(self.normalize(text))
+        return found[2] if found else None
+
+
+# Bounds on one spelling search, so a garbage line cannot stall a session
+SUGGEST_NODE_BUDGET = 4000  # Vocabulary words compared at most
+SUGGEST_TIME_LIMIT = 0.01   # Seconds
+SUGGEST_MAX_LENGTH = 24     # Longer words are not corrected at all
+
+
+def edit_distance(a: str, b: str) -> int:
+    """Levenshtein distance: single-character inserts, deletes and substitutions"""
+    if a == b:
+        return 0
+    start = 0
+    while start < len(a) and start < len(b) and a[start] == b[start]:
+        start += 1
+    a, b = a[start:], b[start:]
+    while a and b and a[-1] == b[-1]:
+        a, b = a[:-1], b[:-1]
+    if len(a) < len(b):
+        a, b = b, a
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (char_a != char_b)))
+        previous = current
+    return previous[-1]
+
+
+def max_typos(word: str) -> int:
+    """Edits tolerated in a word of this length (none in 1-2 letters, two from 6 up)"""
+    return 0 if len(word) < 3 else 1 if len(word) < 6 else 2
+
+
+class BKTree:
+    """Burkhard-Keller tree of words for nearest-spelling search
+
+    Each child hangs off its parent by its edit distance to it, so by the
+    triangle inequality a search within distance k of a query only descends
+    into children whose edge is within k of the parent's own distance.
+    Words can be added at any time; nothing is ever rebuilt.
+    """
+
+    def __init__(self, words: Iterable[str] = ()):
+        self._root: Optional[Tuple[str, Dict[int, tuple]]] = None
+        self._size = 0
+        for word in words:
+            self.add(word)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def add(self, word: str) -> bool:
+        """Insert a word; False if it was already there"""
+        if self._root is None:
+            self._root = (word, {})
+            self._size = 1
+            return True
+        node_word, children = self._root
+        while True:
+            distance = edit_distance(word, node_word)
+            if distance == 0:
+                return False
+            child = children.get(distance)
+            if child is None:
+                children[distance] = (word, {})
+                self._size += 1
+                return True
+            node_word, children = child
+
+    def search(self, word: str, max_distance: int, node_budget: int = SUGGEST_NODE_BUDGET,
+               time_limit: float = SUGGEST_TIME_LIMIT) -> List[Tuple[int, str]]:
+        """(distance, word) pairs within max_distance, nearest first
+
+        Stops early, returning what it has found so far, once node_budget
+        words have been compared or time_limit seconds have passed.
+        """
+        if self._root is None or len(word) > SUGGEST_MAX_LENGTH:
+            return []
+        deadline = time.perf_counter() + time_limit
+        found: List[Tuple[int, str]] = []
+        stack = [self._root]
+        visited = 0
+        while stack and visited < node_budget:
+            visited += 1
+            if not visited % 64 and time.perf_counter() > deadline:
+                break
+            node_word, children = stack.pop()
+            distance = edit_distance(word, node_word)
+            if distance <= max_distance:
+                found.append((distance, node_word))
+            for edge in range(max(1, distance - max_distance), distance + max_distance + 1):
+                child = children.get(edge)
+                if child is not None:
+                    stack.append(child)
+        found.sort()
+        return found
+
+
+class SpellingIndex:
+    """Known words per kind ('command', 'place', 'commodity') for "did you mean" hints
+
+    Every kind is its own BKTree, grown in place as new verbs, locations or
+    commodities appear: sync_world() only indexes the rows added since its
+    last call.
+    """
+
+    def __init__(self, stopwords: Iterable[str] = STOPWORDS):
+        self.stopwords = frozenset(stopwords)
+        self._trees: Dict[str, BKTree] = {}
+        self._words: Dict[str, set] = {}
+        self._locations_seen = 0
+        self._commodities_seen = 0
+
+    def add(self, kind: str, text: str):
+        """Make every word of `text` known under `kind`"""
+        tree = self._trees.setdefault(kind, BKTree())
+        words = self._words.setdefault(kind, set())
+        for word in tokenize(text):
+            if word not in self.stopwords and word not in words:
+                words.add(word)
+                tree.add(word)
+
+    def sync_world(self, world, aliases: Optional[Dict[str, str]] = None):
+        """Index locations and commodities the world gained since the last sync"""
+        for row in range(self._locations_seen, len(world.location_ids)):
+            self.add('place', world.location_names[row])
+            self.add('place', world.system_names[world.system_id[row]])
+        if aliases and not self._locations_seen:
+            for alias in aliases:
+                self.add('place', alias)
+        self._locations_seen = len(world.location_ids)
+        for row in range(self._commodities_seen, len(world.commodity_ids)):
+            self.add('commodity', world.commodity_names[row])
+            self.add('commodity', world.commodity_ids[row].replace('_', ' '))
+        self._commodities_seen = len(world.commodity_ids)
+
+    def knows(self, kind: str, word: str) -> bool:
+        return word in self._words.get(kind, ())
+
+    def nearest(self, kind: str, word: str, accept: Optional[Callable[[str], bool]] = None,
+                time_limit: float = SUGGEST_TIME_LIMIT) -> Optional[str]:
+        """Closest known word within the typo allowance, or None"""
+        tree = self._trees.get(kind)
+        if tree is None or not max_typos(word):
+            return None
+        for _, candidate in tree.search(word, max_typos(word), time_limit=time_limit):
+            if accept is None or accept(candidate):
+                return candidate
+        return None
+
+    def correct(self, kind: str, text: str, time_limit: float = SUGGEST_TIME_LIMIT) -> Optional[str]:
+        """`text` with each unknown word replaced by its nearest known spelling; None if nothing changed
+
+        The whole line shares one time limit; words left when it runs out stay as typed.
+        """
+        deadline = time.perf_counter() + time_limit
+        words = [word for word in tokenize(text) if word not in self.stopwords]
+        fixed = []
+        for word in words:
+            remaining = deadline - time.perf_counter()
+            if not self.knows(kind, word) and remaining > 0:
+                word = self.nearest(kind, word, time_limit=remaining) or word
+            fixed.append(word)
+        return ' '.join(fixed) if fixed != words else None
@@ -0,0 +1,688 @@
+"""
+TradeWinds Market Engine
+Galaxy-wide commodity prices kept in one location x commodity matrix
+"""
+
+import hashlib
+import math
+import random
+from collections.abc import Mapping
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Supply/demand multiplier ranges
+PRODUCER_RANGE = (0.6, 0.8)  # Cheaper where produced
+CONSUMER_RANGE = (1.2, 1.6)  # Expensive where needed
+NEUTRAL_RANGE = (0.9, 1.1)   # Normal price
+
+# Markets drift back towards their supply/demand target at this rate (per day)
+MEAN_REVERSION = 0.1
+
+# Daily shocks older than this many mean-reversion times fold into one draw (weight e^-3)
+SHOCK_HORIZON = 3.0
+MAX_SHOCK_WINDOW = 365
+
+# Equilibrium station stockpiles (units) and the rate stocks return to them (per day)
+PRODUCER_STOCK = 500
+CONSUMER_STOCK = 80
+NEUTRAL_STOCK = 200
+RESTOCK_RATE = 0.08
+
+# Price gaps between connected markets close at this rate (per day, per 1/travel-day of link)
+DIFFUSION_RATE = 0.02
+
+# Log-price shift per unit traded, for commodities that do not set their own elasticity
+DEFAULT_ELASTICITY = 0.005
+
+# Memory set aside for price history across the whole galaxy (bytes)
+HISTORY_BUDGET = 4 * 1024 * 1024
+# Days of prices each location's history buffer holds
+HISTORY_DEPTH = 64
+
+# Independent random streams drawn for every (location, commodity, day) counter
+STREAM_SHOCK = 0
+
+_MASK64 = (1 << 64) - 1
+
+# Market roles, indexing the per-commodity target tables
+ROLE_NEUTRAL = 0
+ROLE_PRODUCER = 1
+ROLE_CONSUMER = 2
+
+# Day stamp of a market row that has never been materialized (or traded at)
+STALE = np.iinfo(np.int64).min
+
+
+def stable_key(name: str) -> int:
+    """64-bit key for an id string that is identical across runs and processes"""
+    return int.from_bytes(hashlib.blake2b(name.encode('utf-8'), digest_size=8).digest(), 'little')
+
+
+def _mix64(x: np.ndarray) -> np.ndarray:
+    """SplitMix64 finalizer applied element-wise to a uint64 array"""
+    x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return x ^ (x >> np.uint64(31))
+
+
+def counter_uniform(seed: int, location_keys, commodity_keys, day, stream: int) -> np.ndarray:
+    """Uniform [0, 1) draws that are a pure function of (seed, location, commodity, day, stream)
+
+    location_keys and commodity_keys are broadcast against each other, so a column
+    of location keys and a row of commodity keys yields a full location x commodity
+    block. Nothing depends on earlier draws, so any day can be computed directly.
+    """
+    return _counter_draw(_counter_base(seed, location_keys, commodity_keys, stream), day)
+
+
+def _counter_base(seed: int, location_keys, commodity_keys, stream: int) -> np.ndarray:
+    """Hash of everything but the day, so many days of one block can share it"""
+    with np.errstate(over='ignore'):
+        h = _mix64(np.asarray(seed & _MASK64, dtype=np.uint64) + np.uint64(stream))
+        h = _mix64(h ^ np.asarray(location_keys, dtype=np.uint64))
+        return _mix64(h ^ np.asarray(commodity_keys, dtype=np.uint64))
+
+
+def _counter_draw(base: np.ndarray, day) -> np.ndarray:
+    with np.errstate(over='ignore'):
+        h = _mix64(base + np.asarray(day, dtype=np.int64).astype(np.uint64))
+    return (h >> np.uint64(11)).astype(np.float64) * (1.0 / (1 << 53))
+
+
+@dataclass
+class Opportunity:
+    """One buy-here / sell-there trade and what it would earn after fuel"""
+    destination: str
+    commodity: str
+    units: int
+    buy_price: int
+    sell_price: int
+    cost: int
+    revenue: int
+    fuel_cost: int
+    profit: int
+
+
+class MarketView(Mapping):
+    """Read-only commodity -> price mapping backed by one row of the price matrix"""
+
+    def __init__(self, engine: 'MarketEngine', row: int):
+        self._engine = engine
+        self._row = row
+
+    def __getitem__(self, commodity_id: str) -> int:
+        column = self._engine.commodity_index[commodity_id]
+        return int(self._engine._ensure(self._row)[column])
+
+    def __iter__(self):
+        return iter(self._engine.commodity_ids)
+
+    def __len__(self) -> int:
+        return len(self._engine.commodity_ids)
+
+    def row(self) -> np.ndarray:
+        """The underlying (read-only) price row, ordered like commodity_ids"""
+        return self._engine._ensure(self._row)
+
+
+class PriceHistory:
+    """Fixed-size ring buffers of past prices, one per location that has traded
+
+    A location gets a buffer the first time its prices are recorded, so the
+    depth stays HISTORY_DEPTH days however large the galaxy is; only the
+    number of buffers is bounded by the memory budget. Once the budget is
+    full, the location recorded longest ago gives up its buffer. Writes are
+    O(1) per market update and reads are vectorized gathers. A budget too
+    small for even one buffer is an error rather than being silently exceeded.
+    """
+
+    def __init__(self, locations: int, commodities: int, budget: int = HISTORY_BUDGET,
+                 depth: int = HISTORY_DEPTH):
+        if depth < 2:
+            raise ValueError(f"History depth must be at least 2 days, got {depth}")
+        self.depth = depth
+        self.max_slots = min(locations, budget // self.bytes_for(1, commodities, depth))
+        if self.max_slots < 1:
+            raise ValueError(f"History budget of {budget:,} bytes cannot hold {depth} days for one "
+                             f"location; it needs at least {self.bytes_for(1, commodities, depth):,}")
+        self._commodities = commodities
+        self._slot = np.full(locations, -1, dtype=np.int64)
+        self._allocate(0)
+
+    def _allocate(self, slots: int):
+        """(Re)allocate empty buffers for `slots` locations"""
+        self.prices = np.zeros((slots, self.depth, self._commodities), dtype=np.uint16)
+        self.days = np.zeros((slots, self.depth), dtype=np.int64)
+        self._owner = np.full(slots, -1, dtype=np.int64)
+        self._head = np.zeros(slots, dtype=np.int64)
+        self._count = np.zeros(slots, dtype=np.int64)
+        self._used = np.zeros(slots, dtype=np.int64)
+        self._tick = 0
+
+    @staticmethod
+    def bytes_for(locations: int, commodities: int, depth: int) -> int:
+        """Memory `depth` entries per location take"""
+        entry_bytes = commodities * np.dtype(np.uint16).itemsize + np.dtype(np.int64).itemsize
+        return locations * depth * entry_bytes
+
+    @property
+    def nbytes(self) -> int:
+        return self.prices.nbytes + self.days.nbytes + self._slot.nbytes
+
+    def _grow(self, slots: int):
+        """Extend every buffer array to `slots` entries, keeping what is recorded"""
+        old = self._owner.size
+        grown = {
+            'prices': np.zeros((slots, self.depth, self._commodities), dtype=np.uint16),
+            'days': np.zeros((slots, self.depth), dtype=np.int64),
+            '_owner': np.full(slots, -1, dtype=np.int64),
+            '_head': np.zeros(slots, dtype=np.int64),
+            '_count': np.zeros(slots, dtype=np.int64),
+            '_used': np.zeros(slots, dtype=np.int64),
+        }
+        for name, array in grown.items():
+            array[:old] = getattr(self, name)
+            setattr(self, name, array)
+
+    def _assign(self, rows: np.ndarray):
+        """Give buffers to the rows that have none, growing or evicting as needed"""
+        missing = rows[self._slot[rows] < 0]
+        if missing.size == 0:
+            return
+        free = np.flatnonzero(self._owner < 0)
+        if free.size < missing.size and self._owner.size < self.max_slots:
+            wanted = self._owner.size + missing.size - free.size
+            self._grow(min(self.max_slots, max(wanted, 2 * self._owner.size)))
+            free = np.flatnonzero(self._owner < 0)
+        if free.size < missing.size:
+            # Evict the buffers recorded longest ago, never one written in this batch
+            taken = np.flatnonzero(self._owner >= 0)
+            taken = taken[~np.isin(self._owner[taken], rows)]
+            evict = taken[np.argsort(self._used[taken], kind='stable')[:missing.size - free.size]]
+            self._slot[self._owner[evict]] = -1
+            self._owner[evict] = -1
+            free = np.concatenate([free, evict])
+        slots = free[:missing.size]
+        self._owner[slots] = missing
+        self._slot[missing] = slots
+        self._head[slots] = 0
+        self._count[slots] = 0
+
+    def record(self, rows: np.ndarray, day: int, prices: np.ndarray):
+        """Append one price row per location; a second write on the same day replaces the first"""
+        rows = np.asarray(rows, dtype=np.int64)[-self.max_slots:]
+        prices = np.asarray(prices)[-self.max_slots:]
+        self._assign(rows)
+        slots = self._slot[rows]
+
+        last = (self._head[slots] - 1) % self.depth
+        same_day = (self._count[slots] > 0) & (self.days[slots, last] == day)
+        position = np.where(same_day, last, self._head[slots])
+
+        self.prices[slots, position] = np.clip(prices, 0, np.iinfo(np.uint16).max)
+        self.days[slots, position] = day
+
+        advance = (~same_day).astype(np.int64)
+        self._head[slots] = (self._head[slots] + advance) % self.depth
+        self._count[slots] = np.minimum(self._count[slots] + advance, self.depth)
+        self._tick += 1
+        self._used[slots] = self._tick
+
+    def clear(self):
+        self._slot[:] = -1
+        self._allocate(0)
+
+    def series(self, row: int, column=slice(None), last: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """(days, prices) for one location in chronological order, optionally only the last N"""
+        slot = int(self._slot[row])
+        if slot < 0:
+            return (np.zeros(0, dtype=np.int64),
+                    np.zeros((0, self._commodities), dtype=np.uint16)[:, column])
+        count = int(self._count[slot])
+        if last is not None:
+            count = min(count, last)
+        order = (self._head[slot] - count + np.arange(count)) % self.depth
+        return self.days[slot, order], self.prices[slot, order][:, column]
+
+
+class MarketEngine:
+    """Holds every market in the galaxy and evolves them lazily in batches
+
+    Each market carries a log supply/demand level that follows an
+    Ornstein-Uhlenbeck process around its produce/consume target, and a
+    finite stockpile that restocks (or depletes) towards its equilibrium.
+    The undisturbed level on any day is a pure function of seed, market and
+    day - a decaying sum of the last few weeks of daily shocks - so prices
+    never depend on which days a market was read, a market that has not
+    been read for 200 days costs the same to price as one read yesterday,
+    and markets nobody reads are never touched. Trades (and diffusion
+    between traded markets) push a market off that path; the push decays
+    at the mean-reversion rate and the stock deficit at the restock rate.
+
+    With price_impact enabled, prices rise as stock falls below equilibrium:
+    every missing unit adds the commodity's elasticity to the log price.
+
+    Once a trade graph is set, advance_to() also lets price gaps between
+    connected traded markets relax towards each other (see diffuse()); an
+    engine built with from_world() follows later route edits in its world.
+    """
+
+    def __init__(self, commodity_ids, base_prices, volatility,
+                 location_ids, produces, consumes, seed: Optional[int] = None,
+                 mean_reversion: float = MEAN_REVERSION, history_budget: int = HISTORY_BUDGET,
+                 elasticity=DEFAULT_ELASTICITY, price_impact: bool = False,
+                 restock_rate: float = RESTOCK_RATE, diffusion_rate: float = DIFFUSION_RATE):
+        self.commodity_ids = list(commodity_ids)
+        self.location_ids = list(location_ids)
+        self.commodity_index = {cid: i for i, cid in enumerate(self.commodity_ids)}
+        self.location_index = {lid: i for i, lid in enumerate(self.location_ids)}
+
+        self.base_prices = np.asarray(base_prices, dtype=np.float64)
+        self.volatility = np.asarray(volatility, dtype=np.float64)
+        self.mean_reversion = mean_reversion
+
+        self.restock_rate = restock_rate
+        self.diffusion_rate = diffusion_rate
+
+        # Order-size pricing: every unit bought (sold) raises (lowers) the log price by elasticity
+        self.elasticity = np.broadcast_to(np.asarray(elasticity, dtype=np.float64), self.base_prices.shape)
+        self.price_impact = price_impact
+
+        # Every market is a producer, consumer or neutral; targets and spreads are
+        # per (role, commodity) tables, so a huge galaxy only pays one byte per market.
+        # The long-run spread matches the old uniform supply/demand range plus volatility.
+        produces = np.asarray(produces, dtype=bool)
+        consumes = np.asarray(consumes, dtype=bool) & ~produces
+        shape = (len(self.location_ids), len(self.commodity_ids))
+        self._role = np.full(shape, ROLE_NEUTRAL, dtype=np.int8)
+        self._role[produces] = ROLE_PRODUCER
+        self._role[consumes] = ROLE_CONSUMER
+        self._columns = np.arange(shape[1])
+        low, high = np.array([NEUTRAL_RANGE, PRODUCER_RANGE, CONSUMER_RANGE]).T[:, :, None]
+        midpoint = (low + high) / 2
+        self._role_target = np.broadcast_to(np.log(midpoint), (3, shape[1]))
+        self._role_spread = np.sqrt(((high - low) / midpoint) ** 2 + (2 * self.volatility) ** 2) / np.sqrt(12)
+        self._role_stock = np.broadcast_to(
+            np.array([NEUTRAL_STOCK, PRODUCER_STOCK, CONSUMER_STOCK], dtype=np.float64)[:, None],
+            (3, shape[1]))
+
+        # Counter-based randomness: every shock is a pure function of seed, ids and day
+        self.seed = random.getrandbits(64) if seed is None else seed
+        self.day = 0
+        self._location_keys = np.array([stable_key(lid) for lid in self.location_ids], dtype=np.uint64)
+        self._commodity_keys = np.array([stable_key(cid) for cid in self.commodity_ids], dtype=np.uint64)
+
+        # The latent path sums this many daily shocks plus one older draw
+        self._window = int(min(MAX_SHOCK_WINDOW, math.ceil(SHOCK_HORIZON / max(mean_reversion, 1e-9))))
+
+        # Displacement from the seeded path left by trades and diffusion, as of each row's anchor day
+        self._shift = np.zeros(shape)
+        self._surplus = np.zeros(shape)
+        self._anchor = np.full(shape[0], STALE, dtype=np.int64)
+
+        # Rows are only priced when read; each row remembers the day its cached state refers to
+        self._level = np.zeros(shape)
+        self._stock = np.zeros(shape)
+        self._prices = np.ones(shape, dtype=np.int64)
+        self._stamp = np.full(shape[0], STALE, dtype=np.int64)
+        self.prices = self._prices.view()
+        self.prices.flags.writeable = False
+        self._views = [MarketView(self, row) for row in range(shape[0])]
+        self.history = PriceHistory(shape[0], shape[1], history_budget)
+        self.set_trade_graph([])
+
+        # World whose routes are the trade graph (from_world), and the graph_version last copied
+        self._world = None
+        self._world_version = None
+
+    @classmethod
+    def from_world(cls, world, **kwargs) -> 'MarketEngine':
+        """Build an engine over a WorldStore, with its routes as the trade graph"""
+        engine = cls(
+            world.commodity_ids, world.base_prices, world.volatility,
+            world.location_ids, world.produce_mask(), world.consume_mask(),
+            elasticity=world.elasticity, **kwargs
+        )
+        engine._world = world
+        engine._sync_trade_graph()
+        return engine
+
+    @classmethod
+    def from_catalog(cls, commodities: Dict[str, object], locations: Dict[str, object],
+                     **kwargs) -> 'MarketEngine':
+        """Build an engine from COMMODITIES / LOCATIONS style dictionaries"""
+        commodity_index = {cid: i for i, cid in enumerate(commodities)}
+        produces = np.zeros((len(locations), len(commodities)), dtype=bool)
+        consumes = np.zeros_like(produces)
+        for row, location in enumerate(locations.values()):
+            for cid in location.produces:
+                produces[row, commodity_index[cid]] = True
+            for cid in location.consumes:
+                consumes[row, commodity_index[cid]] = True
+
+        return cls(
+            commodities,
+            [c.base_price for c in commodities.values()],
+            [c.volatility for c in commodities.values()],
+            locations, produces, consumes,
+            elasticity=[c.elasticity for c in commodities.values()], **kwargs
+        )
+
+    def set_trade_graph(self, edges: Iterable[Tuple[str, str, float]]):
+        """Connect markets with (origin, destination, travel_time) edges for price diffusion
+
+        Edges are kept as flat origin / destination / weight arrays, so one
+        diffusion step is a sparse matrix-vector product over the live edges.
+        """
+        edges = [(self.location_index[a], self.location_index[b], t) for a, b, t in edges]
+        self._edge_origin = np.array([e[0] for e in edges], dtype=np.intp)
+        self._edge_dst = np.array([e[1] for e in edges], dtype=np.intp)
+        self._edge_weight = 1.0 / np.maximum(np.array([e[2] for e in edges], dtype=np.float64), 1e-9)
+
+    def _sync_trade_graph(self):
+        """Re-read the trade graph from the world after its routes have changed"""
+        if self._world is not None and self._world_version != self._world.graph_version:
+            self.set_trade_graph(self._world.edges())
+            self._world_version = self._world.graph_version
+
+    def _rows(self, location_ids: Optional[Iterable[str]]) -> np.ndarray:
+        if location_ids is None:
+            return np.arange(len(self.location_ids))
+        return np.fromiter((self.location_index[lid] for lid in location_ids), dtype=np.intp)
+
+    def _by_role(self, table: np.ndarray, rows: np.ndarray, columns=slice(None)) -> np.ndarray:
+        """Expand a (role, commodity) table to the given rows x columns block"""
+        return table[self._role[rows][:, columns], self._columns[columns]]
+
+    def _latent(self, rows: np.ndarray, day: int, columns=slice(None)) -> np.ndarray:
+        """Undisturbed log level around the target on `day`, a pure function of seed, market and day
+
+        X(D) = spread * (sqrt(1 - a^2) * sum_{j<W} a^j Z(D-j) + a^W Z(D-W)) with
+        a = exp(-mean_reversion) and Z zero-mean, unit-variance daily shocks:
+        every day has the long-run spread and consecutive days are correlated
+        by a (up to a^(2W-2)), like the exact OU transition, but no earlier
+        reading is needed to get there. The shocks are uniform - one hash per
+        market and day - since the weighted sum is close to normal anyway.
+        """
+        decay = math.exp(-self.mean_reversion)
+        step = math.sqrt(1 - decay ** 2)
+        base = _counter_base(self.seed, self._location_keys[rows][:, None],
+                             self._commodity_keys[columns], STREAM_SHOCK)
+        total = np.zeros(base.shape)
+        for lag in range(self._window + 1):
+            weight = decay ** lag * (step if lag < self._window else 1.0)
+            total += weight * math.sqrt(12) * (_counter_draw(base, day - lag) - 0.5)
+        return self._by_role(self._role_spread, rows, columns) * total
+
+    def _advance(self, rows: np.ndarray, day: int, columns=slice(None)) -> Tuple[np.ndarray, np.ndarray]:
+        """Log levels and stocks of the given markets on `day` (nothing is stored)"""
+        anchor = self._anchor[rows]
+        disturbed = anchor != STALE
+        elapsed = day - np.where(disturbed, anchor, day)
+        if (elapsed < 0).any():
+            raise ValueError(f"Markets cannot be moved back in time to day {day}")
+
+        # Trade and diffusion displacements fade; producers restock and consumers use up surplus
+        fade = np.exp(-self.mean_reversion * elapsed)[:, None]
+        restock = np.exp(-self.restock_rate * elapsed)[:, None]
+        level = (self._by_role(self._role_target, rows, columns) + self._latent(rows, day, columns)
+                 + self._shift[rows][:, columns] * fade)
+        stock = self._by_role(self._role_stock, rows, columns) + self._surplus[rows][:, columns] * restock
+        return level, stock
+
+    def _reanchor(self, rows: np.ndarray):
+        """Fade the given markets' displacement to the current day, ready to be changed"""
+        anchor = self._anchor[rows]
+        elapsed = self.day - np.where(anchor != STALE, anchor, self.day)
+        self._shift[rows] *= np.exp(-self.mean_reversion * elapsed)[:, None]
+        self._surplus[rows] *= np.exp(-self.restock_rate * elapsed)[:, None]
+        self._anchor[rows] = self.day
+
+    def _to_prices(self, rows: np.ndarray, level: np.ndarray, stock: np.ndarray,
+                   columns=slice(None)) -> np.ndarray:
+        shortage = self._by_role(self._role_stock, rows, columns) - stock
+        if self.price_impact:
+            level = level + self.elasticity[columns] * shortage
+        final_prices = np.floor(self.base_prices[columns] * np.exp(level))
+        return np.maximum(1, final_prices).astype(np.int64)
+
+    def _store(self, rows: np.ndarray):
+        level, stock = self._advance(rows, self.day)
+        self._level[rows] = level
+        self._stock[rows] = stock
+        self._prices[rows] = self._to_prices(rows, level, stock)
+        self._stamp[rows] = self.day
+        self.history.record(rows, self.day, self._prices[rows])
+
+    def prices_on(self, day: int, location_ids: Optional[Iterable[str]] = None) -> np.ndarray:
+        """Projected price block for a future day, computed in closed form without storing it"""
+        rows = self._rows(location_ids)
+        return self._to_prices(rows, *self._advance(rows, day))
+
+    def quote(self, location_id: str, commodity_id: str, day: int) -> int:
+        """Projected price of one commodity at one location on a future day, in O(1)"""
+        rows = np.array([self.location_index[location_id]])
+        columns = np.array([self.commodity_index[commodity_id]])
+        return int(self._to_prices(rows, *self._advance(rows, day, columns), columns)[0, 0])
+
+    def diffuse(self, days: float):
+        """Relax price gaps between connected markets over `days`
+
+        Each market moves towards the travel-time weighted average of its
+        neighbours by 1 - exp(-rate * weight * days), which is stable for any
+        step length. Only markets already pushed off their seeded path by a
+        trade take part, and only along edges between two of them: which
+        markets were merely read never changes prices, and markets nobody has
+        traded at stay lazy. The markets involved are brought up to the
+        current day first.
+        """
+        self._sync_trade_graph()
+        if days <= 0 or self._edge_dst.size == 0 or self.diffusion_rate <= 0:
+            return
+        live = self._anchor != STALE
+        linked = live[self._edge_origin] & live[self._edge_dst]
+        if not linked.any():
+            return
+        origin = self._edge_origin[linked]
+        dst = self._edge_dst[linked]
+        weight = self._edge_weight[linked]
+        self._refresh(np.concatenate([origin, dst]))
+
+        rows, local = np.unique(origin, return_inverse=True)
+        neighbour_sum = np.zeros((rows.size, self._level.shape[1]))
+        np.add.at(neighbour_sum, local, weight[:, None] * self._level[dst])
+        degree = np.bincount(local, weights=weight, minlength=rows.size)[:, None]
+        blend = -np.expm1(-self.diffusion_rate * degree * days)
+        pull = blend * (neighbour_sum / degree - self._level[rows])
+        self._reanchor(rows)
+        self._shift[rows] += pull
+        self._level[rows] += pull
+
+        self._prices[rows] = self._to_prices(rows, self._level[rows], self._stock[rows])
+        self.history.record(rows, self.day, self._prices[rows])
+
+    def advance_to(self, day: int):
+        """Move game time forward; markets catch up lazily, diffusion runs between live markets"""
+        elapsed = day - self.day
+        if elapsed < 0:
+            raise ValueError(f"Markets cannot be moved back in time to day {day}")
+        self.day = day
+        self.diffuse(elapsed)
+
+    def reseed(self, seed: int, day: int = 0):
+        """Switch to a new seed and day, dropping all market state"""
+        self.seed = seed
+        self.day = day
+        self._stamp[:] = STALE
+        self._anchor[:] = STALE
+        self._shift[:] = 0
+        self._surplus[:] = 0
+        self.history.clear()
+
+    def _ensure(self, row: int) -> np.ndarray:
+        if self._stamp[row] != self.day:
+            self._store(np.array([row]))
+        return self.prices[row]
+
+    def materialize(self, location_ids: Optional[Iterable[str]] = None) -> np.ndarray:
+        """Bring the given (default: all) markets up to the current day in one batch
+
+        Returns the read-only price matrix; only the requested rows are guaranteed fresh.
+        """
+        self._refresh(self._rows(location_ids))
+        return self.prices
+
+    def _refresh(self, rows: np.ndarray):
+        stale = rows[self._stamp[rows] != self.day]
+        if stale.size:
+            self._store(np.unique(stale))
+
+    def regenerate(self, location_ids: Optional[Iterable[str]] = None):
+        """Forget trades at the given (default: all) markets, putting them back on their seeded path"""
+        rows = self._rows(location_ids)
+        self._anchor[rows] = STALE
+        self._shift[rows] = 0
+        self._surplus[rows] = 0
+        self._store(rows)
+
+    def available(self, location_id: str, commodity_id: str) -> int:
+        """Whole units currently in the station's stockpile"""
+        row = self.location_index[location_id]
+        self._ensure(row)
+        return int(self._stock[row, self.commodity_index[commodity_id]])
+
+    def _impact(self, location_id: str, commodity_id: str) -> Tuple[int, float]:
+        """Current unit price and per-unit elasticity of one market"""
+        row = self.location_index[location_id]
+        column = self.commodity_index[commodity_id]
+        price = int(self._ensure(row)[column])
+        return price, float(self.elasticity[column]) if self.price_impact else 0.0
+
+    def buy_quote(self, location_id: str, commodity_id: str, quantity: int) -> int:
+        """Total cost of buying `quantity` units, integrating the price up the impact curve"""
+        price, k = self._impact(location_id, commodity_id)
+        if k == 0:
+            return price * quantity
+        return int(round(price * math.expm1(k * quantity) / k))
+
+    def sell_quote(self, location_id: str, commodity_id: str, quantity: int) -> int:
+        """Total revenue from selling `quantity` units, integrating the price down the impact curve"""
+        price, k = self._impact(location_id, commodity_id)
+        if k == 0:
+            return price * quantity
+        return int(round(-price * math.expm1(-k * quantity) / k))
+
+    def max_affordable(self, location_id: str, commodity_id: str, budget: int) -> int:
+        """Largest quantity in stock whose buy_quote fits in `budget`, found by inverting the impact curve"""
+        price, k = self._impact(location_id, commodity_id)
+        in_stock = self.available(location_id, commodity_id)
+        if budget <= 0:
+            return 0
+        if k == 0:
+            return min(budget // price, in_stock)
+
+        quantity = min(int(math.log1p(k * budget / price) / k), in_stock)
+        while quantity > 0 and self.buy_quote(location_id, commodity_id, quantity) > budget:
+            quantity -= 1  # Integer rounding of the quote can overshoot by a unit
+        return quantity
+
+    def execute_trade(self, location_id: str, commodity_id: str, quantity: int):
+        """Apply a completed trade to the market: positive quantity was bought, negative sold"""
+        rows = np.array([self.location_index[location_id]])
+        columns = np.array([self.commodity_index[commodity_id]])
+        self._ensure(rows[0])
+        self._reanchor(rows)
+
+        stock = np.maximum(0.0, self._stock[rows, columns] - quantity)
+        self._surplus[rows, columns] = stock - self._by_role(self._role_stock, rows, columns)[:, 0]
+        self._stock[rows, columns] = stock
+        self._prices[rows, columns] = self._to_prices(
+            rows, self._level[rows, columns][:, None], stock[:, None], columns)[:, 0]
+        self.history.record(rows, self.day, self._prices[rows])
+
+    def _full_hold(self, origin_rows: np.ndarray, dest_rows: np.ndarray, budget, cargo_space: int):
+        """Per-commodity full-hold trades bought at each origin row and sold at the paired dest row
+
+        Units are limited by cargo space, the origin's stock and what `budget`
+        (a scalar or one value per pair) buys up the impact curve. Returns
+        (units, buy, sell, cost, revenue), each pairs x commodities.
+        """
+        self._refresh(np.concatenate([origin_rows, dest_rows]))
+        buy = self.prices[origin_rows].astype(np.float64)
+        sell = self.prices[dest_rows].astype(np.float64)
+        budget = np.maximum(np.asarray(budget, dtype=np.float64), 0)
+        if budget.ndim:
+            budget = budget[:, None]
+
+        k = self.elasticity if self.price_impact else np.zeros_like(self.elasticity)
+        impact = k > 0
+        safe_k = np.where(impact, k, 1.0)
+        affordable = np.where(impact, np.floor(np.log1p(safe_k * budget / buy) / safe_k), budget // buy)
+        units = np.minimum(np.minimum(affordable, cargo_space), np.floor(self._stock[origin_rows]))
+        units = np.maximum(units, 0)
+
+        cost = np.where(impact, np.round(buy * np.expm1(safe_k * units) / safe_k), buy * units)
+        revenue = np.where(impact, np.round(-sell * np.expm1(-safe_k * units) / safe_k), sell * units)
+        return units, buy, sell, cost, revenue
+
+    def opportunities(self, origin: str, destinations: Sequence[str], fuel_costs: Sequence[int],
+                      budget: int, cargo_space: int, top: int = 5) -> List[Opportunity]:
+        """Most profitable full-hold trades from `origin` to any of `destinations`
+
+        Scores every (destination, commodity) pair in one vectorized pass over
+        the price table - including stock, budget and price impact - and
+        picks the best `top` with a partial selection rather than a full sort.
+        """
+        if not len(destinations) or cargo_space <= 0 or budget <= 0:
+            return []
+        rows = self._rows(destinations)
+        origins = np.full(rows.size, self.location_index[origin])
+        units, buy, sell, cost, revenue = self._full_hold(origins, rows, budget, cargo_space)
+        fuel = np.asarray(fuel_costs, dtype=np.float64)[:, None]
+        profit = revenue - cost - fuel
+
+        flat = profit.ravel()
+        top = min(top, flat.size)
+        best = np.argpartition(-flat, top - 1)[:top]
+        best = best[np.argsort(-flat[best], kind='stable')]
+
+        results = []
+        for index in best:
+            d, c = divmod(int(index), len(self.commodity_ids))
+            if profit[d, c] <= 0 or units[d, c] <= 0:
+                break
+            results.append(Opportunity(
+                destinations[d], self.commodity_ids[c], int(units[d, c]),
+                int(buy[d, c]), int(sell[d, c]), int(cost[d, c]), int(revenue[d, c]),
+                int(fuel[d, 0]), int(profit[d, c])
+            ))
+        return results
+
+    def best_trades(self, origin_rows: np.ndarray, dest_rows: np.ndarray, budget,
+                    cargo_space: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Best single-commodity full-hold trade along each (origin, destination) row pair
+
+        Returns (commodity column, units, profit before fuel) per pair; pairs
+        with no profitable cargo get column -1, zero units and zero profit.
+        """
+        units, _, _, cost, revenue = self._full_hold(origin_rows, dest_rows, budget, cargo_space)
+        gain = revenue - cost
+        column = np.argmax(gain, axis=1)
+        pairs = np.arange(gain.shape[0])
+        profit = gain[pairs, column]
+        worthwhile = profit > 0
+        return (np.where(worthwhile, column, -1),
+                np.where(worthwhile, units[pairs, column], 0).astype(np.int64),
+                np.where(worthwhile, profit, 0.0))
+
+    def price_history(self, location_id: str, commodity_id: Optional[str] = None,
+                      last: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """Recorded (days, prices) at a location, for one commodity or as a days x commodities block"""
+        column = slice(None) if commodity_id is None else self.commodity_index[commodity_id]
+        return self.history.series(self.location_index[location_id], column, last)
+
+    def view(self, location_id: str) -> MarketView:
+        """Read-only price mapping for one location"""
+        return self._views[self.location_index[location_id]]
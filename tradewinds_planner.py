@@ -0,0 +1,186 @@
+"""
+TradeWinds Trade Planner
+Searches the route graph for the trading loop that earns the most per day
+"""
+
+import time
+from dataclasses import dataclass
+from typing import Callable, List, Optional, Tuple
+
+import numpy as np
+
+# Longest loop considered, in jumps, by default and at most
+DEFAULT_MAX_HOPS = 4
+MAX_PLAN_HOPS = 12
+
+# Wall-clock budget for one search (seconds); the best loop found so far is returned
+PLAN_TIME_BUDGET = 0.25
+
+# Search nodes expanded between deadline checks
+DEADLINE_CHECK_EVERY = 256
+
+
+@dataclass
+class TradeLeg:
+    """One jump of a loop and the cargo carried on it (commodity None = fly empty)"""
+    origin: str
+    destination: str
+    commodity: Optional[str]
+    units: int
+    travel_time: float
+    fuel_cost: int
+    profit: int  # Trade profit after fuel
+
+
+@dataclass
+class TradeLoop:
+    """A round trip back to the starting station"""
+    legs: List[TradeLeg]
+    profit: int
+    travel_time: float
+    complete: bool = True  # False if the search ran out of time before proving this is the best
+
+    @property
+    def per_day(self) -> float:
+        return self.profit / self.travel_time
+
+
+class LoopPlanner:
+    """Branch-and-bound search for the most profitable trading loop per day
+
+    Each jump carries the best single full hold for the current talents (the
+    budget does not compound along the loop), so a jump's profit is a fixed
+    edge value. Only the stations within max_hops of the start are touched,
+    which keeps the cost independent of the size of the galaxy.
+
+    Return paths are memoized in Bellman-Ford style tables: for every station
+    and every number of jumps left, the most profit and the least time of
+    any way back home. A partial loop is pruned once
+    (profit so far + best return profit) / (time so far + fastest return)
+    cannot beat the best loop already found. The search stops at a deadline
+    and returns the best loop so far.
+    """
+
+    def __init__(self, world, market, fuel_cost: Callable[[float], int],
+                 max_hops: int = DEFAULT_MAX_HOPS, time_budget: float = PLAN_TIME_BUDGET):
+        self.world = world
+        self.market = market
+        self.fuel_cost = fuel_cost
+        self.max_hops = max_hops
+        self.time_budget = time_budget
+
+    def _neighbourhood(self, origin: int, hops: int, deadline: float) -> Tuple[np.ndarray, int]:
+        """Sorted rows reachable from origin in fewer than `hops` jumps, and the loop length they allow
+
+        Stops growing at the deadline; the second value is then the longest loop the rows found so
+        far can hold.
+        """
+        adjacency = self.world.adjacency
+        seen = {origin}
+        frontier = [origin]
+        for level in range(1, hops):
+            if time.perf_counter() > deadline:
+                hops = level
+                break
+            frontier = [dest for row in frontier for dest in adjacency[row] if dest not in seen]
+            seen.update(frontier)
+        return np.sort(np.fromiter(seen, dtype=np.intp)), hops
+
+    def plan(self, origin: str, budget: int, cargo_space: int, max_hops: Optional[int] = None,
+             time_budget: Optional[float] = None) -> Optional[TradeLoop]:
+        """Best loop from origin back to origin, or None if no loop makes a profit
+
+        max_hops is clamped to MAX_PLAN_HOPS. The time budget covers the whole call; if it runs
+        out while the neighbourhood or return tables are built, only shorter loops are searched.
+        """
+        wanted = min(max(1, max_hops or self.max_hops), MAX_PLAN_HOPS)
+        deadline = time.perf_counter() + (self.time_budget if time_budget is None else time_budget)
+        origin_row = self.world.location_index[origin]
+        adjacency = self.world.adjacency
+
+        # Edges inside the neighbourhood, valued once for this search
+        rows, hops = self._neighbourhood(origin_row, wanted, deadline)
+        inside = set(rows.tolist())
+        edges = [(a, b, t) for a in rows.tolist() for b, t in adjacency[a].items() if b in inside]
+        if not edges:
+            return None
+        src_rows = np.array([e[0] for e in edges], dtype=np.intp)
+        dst_rows = np.array([e[1] for e in edges], dtype=np.intp)
+        travel = np.array([e[2] for e in edges], dtype=np.float64)
+        fuel = np.array([self.fuel_cost(t) for t in travel.tolist()], dtype=np.float64)
+        column, units, gain = self.market.best_trades(src_rows, dst_rows, budget - fuel, cargo_space)
+        value = gain - fuel
+
+        # The search works on neighbourhood positions, so its tables do not grow with the galaxy
+        src = np.searchsorted(rows, src_rows)
+        dst = np.searchsorted(rows, dst_rows)
+        home = int(np.searchsorted(rows, origin_row))
+
+        # Memoized return paths: best profit / least time back home within k jumps
+        n = len(rows)
+        best_back = np.full((hops + 1, n), -np.inf)
+        fastest_back = np.full((hops + 1, n), np.inf)
+        best_back[:, home] = 0.0
+        fastest_back[:, home] = 0.0
+        for k in range(1, hops + 1):
+            if time.perf_counter() > deadline:
+                hops = k - 1
+                break
+            np.maximum.at(best_back[k], src, value + best_back[k - 1][dst])
+            np.minimum.at(fastest_back[k], src, travel + fastest_back[k - 1][dst])
+            best_back[k, home] = 0.0
+            fastest_back[k, home] = 0.0
+
+        if hops == 0:
+            return None
+
+        outgoing = {}
+        for index, a in enumerate(src.tolist()):
+            outgoing.setdefault(a, []).append(index)
+
+        best = [0.0, None]  # Best profit per day so far and its edge path
+        expanded = [0]
+        timed_out = [hops < wanted]
+
+        def search(node: int, depth: int, profit: float, elapsed: float, path: List[int]):
+            expanded[0] += 1
+            if expanded[0] % DEADLINE_CHECK_EVERY == 0 and time.perf_counter() > deadline:
+                timed_out[0] = True
+            left = hops - depth - 1
+            children = []
+            for edge in outgoing.get(node, ()):
+                dest = dst[edge]
+                p = profit + value[edge]
+                t = elapsed + travel[edge]
+                if dest == home:
+                    if p / t > best[0]:
+                        best[0], best[1] = p / t, path + [edge]
+                    continue
+                reach = p + best_back[left, dest]
+                if left == 0 or reach <= 0:
+                    continue
+                bound = reach / (t + fastest_back[left, dest])
+                children.append((bound, edge, p, t))
+
+            # Most promising first, so good loops are found early and prune harder
+            children.sort(reverse=True)
+            for bound, edge, p, t in children:
+                if timed_out[0] or bound <= best[0]:
+                    break
+                search(int(dst[edge]), depth + 1, p, t, path + [edge])
+
+        search(home, 0, 0.0, 0.0, [])
+        if best[1] is None:
+            return None
+
+        ids = self.world.location_ids
+        legs = [
+            TradeLeg(
+                ids[src_rows[e]], ids[dst_rows[e]],
+                self.market.commodity_ids[column[e]] if column[e] >= 0 else None,
+                int(units[e]), float(travel[e]), int(fuel[e]), int(round(value[e]))
+            )
+            for e in best[1]
+        ]
+        return TradeLoop(legs, sum(leg.profit for leg in legs), sum(leg.travel_time for leg in legs),
+                         complete=not timed_out[0])
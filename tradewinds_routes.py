@@ -0,0 +1,563 @@
+"""
+TradeWinds Route Planner
+Shortest multi-hop routes over the world's travel graph, cached per source
+"""
+
+import heapq
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+# Route metrics: total travel time (days) or total fuel bill (talents)
+METRICS = ('time', 'fuel')
+
+# Shortest-path trees kept in memory; each holds two arrays the size of the galaxy
+ROUTE_CACHE_SIZE = 128
+
+# Route queries from one source answered by the system search before its full tree is cached
+TREE_AFTER_QUERIES = 3
+
+# System-level distance tables kept per destination system (one float per system each)
+BOUND_CACHE_SIZE = 16
+
+# Predecessor of a source (or of a location it cannot reach)
+NO_PREDECESSOR = -1
+
+
+@dataclass
+class Route:
+    """A chain of direct hops from one location to another"""
+    stops: List[str]   # Location ids, origin first and destination last
+    legs: List[float]  # Travel time of each hop
+    travel_time: float
+    fuel_cost: int
+    refuels: List[Tuple[str, int, int]] = field(default_factory=list)  # (location, units, talents)
+    fuel_left: Optional[int] = None  # Units in the tank on arrival (fuel-tank routes only)
+
+    @property
+    def hops(self) -> int:
+        return len(self.legs)
+
+
+class SystemRouter:
+    """Two-level route search: stations inside star systems, portals between them
+
+    A portal is a station with a lane to another system. For each portal the
+    router keeps a small shortest-path tree restricted to its own system,
+    giving shortcuts to every station there that has a lane out. A query
+    walks real lanes only inside the origin and destination systems; every
+    system in between is crossed in one shortcut from the portal it was
+    entered by.
+
+    The search is A*, guided by the system graph: one node per system and,
+    for each pair of linked systems, the cheapest lane between them. Its
+    distances to the destination's system never overestimate, so the
+    station-level search only settles stations in systems on or near the
+    best system-level course.
+
+    Portal trees are built on first use. The world's change log drops the
+    trees of systems whose lanes changed and re-prices affected system links.
+    """
+
+    def __init__(self, world, weights: Dict[str, Callable[[float], float]]):
+        self.world = world
+        self.weights = weights
+        self.version = world.graph_version
+        self.members: List[List[int]] = [[] for _ in world.system_names]
+        for row, system in enumerate(world.system_id.tolist()):
+            self.members[system].append(row)
+        self._local: Dict[int, Dict[Tuple[int, str], Tuple[List[Tuple[int, float]], Dict[int, int]]]] = {}
+        self._links: Dict[str, List[Dict[int, float]]] = {}  # metric -> system -> {system it links to: cheapest lane}
+        self._bounds: 'OrderedDict[Tuple[int, str], List[float]]' = OrderedDict()
+        self.last_settled = 0  # Stations settled by the most recent query
+
+    def _sync(self):
+        if self.version == self.world.graph_version:
+            return
+        changes = self.world.changes_since(self.version)
+        self._bounds.clear()
+        if changes is None:
+            self._local.clear()
+            self._links.clear()
+        else:
+            system_id = self.world.system_id
+            for change in changes:
+                origin, dest = int(system_id[change.origin]), int(system_id[change.destination])
+                self._local.pop(origin, None)
+                self._local.pop(dest, None)
+                if origin != dest:
+                    for metric in self._links:
+                        self._price_link(metric, origin, dest)
+        self.version = self.world.graph_version
+
+    def _price_link(self, metric: str, origin: int, dest: int):
+        weight = self.weights[metric]
+        system_id, adjacency = self.world.system_id, self.world.adjacency
+        costs = [weight(t) for row in self.members[origin] for target, t in adjacency[row].items()
+                 if system_id[target] == dest]
+        links = self._links[metric][origin]
+        if costs:
+            links[dest] = min(costs)
+        else:
+            links.pop(dest, None)
+
+    def _system_links(self, metric: str) -> List[Dict[int, float]]:
+        links = self._links.get(metric)
+        if links is None:
+            weight = self.weights[metric]
+            system_id = self.world.system_id.tolist()
+            links = self._links[metric] = [{} for _ in self.members]
+            for row, lanes in enumerate(self.world.adjacency):
+                origin = system_id[row]
+                for target, travel_time in lanes.items():
+                    dest = system_id[target]
+                    if dest != origin:
+                        cost = weight(travel_time)
+                        if cost < links[origin].get(dest, float('inf')):
+                            links[origin][dest] = cost
+        return links
+
+    def _system_bounds(self, target_system: int, metric: str) -> List[float]:
+        """Lower bound on the cost from each system to the target system"""
+        key = (target_system, metric)
+        if key in self._bounds:
+            self._bounds.move_to_end(key)
+            return self._bounds[key]
+        links = self._system_links(metric)
+        incoming: Dict[int, List[Tuple[int, float]]] = {}
+        for origin, dests in enumerate(links):
+            for dest, cost in dests.items():
+                incoming.setdefault(dest, []).append((origin, cost))
+        bound = [float('inf')] * len(links)
+        bound[target_system] = 0.0
+        heap = [(0.0, target_system)]
+        while heap:
+            d, system = heapq.heappop(heap)
+            if d > bound[system]:
+                continue
+            for origin, cost in incoming.get(system, ()):
+                nd = d + cost
+                if nd < bound[origin]:
+                    bound[origin] = nd
+                    heapq.heappush(heap, (nd, origin))
+        self._bounds[key] = bound
+        if len(self._bounds) > BOUND_CACHE_SIZE:
+            self._bounds.popitem(last=False)
+        return bound
+
+    def _portal_tree(self, row: int, metric: str) -> Tuple[List[Tuple[int, float]], Dict[int, int]]:
+        """Exits reachable from `row` without leaving its system, and the local predecessor map"""
+        system_id = self.world.system_id
+        system = int(system_id[row])
+        trees = self._local.setdefault(system, {})
+        tree = trees.get((row, metric))
+        if tree is None:
+            adjacency = self.world.adjacency
+            weight = self.weights[metric]
+            dist = {row: 0.0}
+            pred = {row: NO_PREDECESSOR}
+            heap = [(0.0, row)]
+            exits = []
+            while heap:
+                d, node = heapq.heappop(heap)
+                if d > dist[node]:
+                    continue
+                crosses = False
+                for target, travel_time in adjacency[node].items():
+                    if system_id[target] != system:
+                        crosses = True
+                        continue
+                    nd = d + weight(travel_time)
+                    if nd < dist.get(target, float('inf')):
+                        dist[target] = nd
+                        pred[target] = node
+                        heapq.heappush(heap, (nd, target))
+                if crosses and node != row:
+                    exits.append((node, d))
+            tree = trees[(row, metric)] = (exits, pred)
+        return tree
+
+    def path(self, source: int, target: int, metric: str = 'time') -> Optional[List[int]]:
+        """Rows of the cheapest route from source to target, or None if it cannot be reached"""
+        self._sync()
+        adjacency, system_id = self.world.adjacency, self.world.system_id
+        weight = self.weights[metric]
+        ends = {int(system_id[source]), int(system_id[target])}
+        bound = self._system_bounds(int(system_id[target]), metric)
+
+        def h(row: int) -> float:
+            return bound[system_id[row]]
+
+        dist = {source: 0.0}
+        pred: Dict[int, Tuple[int, bool]] = {source: (NO_PREDECESSOR, False)}  # (previous row, via shortcut)
+        closed = set()
+        heap = [(h(source), 0.0, source)]
+        while heap:
+            _, d, node = heapq.heappop(heap)
+            if node in closed:
+                continue
+            closed.add(node)
+            if node == target:
+                break
+            system = int(system_id[node])
+            if system in ends:
+                steps = [(t, weight(time), False) for t, time in adjacency[node].items()]
+            else:
+                # Entered through a portal: cross the system in one shortcut, or leave it directly.
+                # A station reached by shortcut only leaves; its entry portal offered the rest.
+                steps = [(t, weight(time), False) for t, time in adjacency[node].items()
+                         if system_id[t] != system]
+                if not pred[node][1]:
+                    exits, _ = self._portal_tree(node, metric)
+                    steps += [(exit_row, cost, True) for exit_row, cost in exits]
+            for nxt, cost, shortcut in steps:
+                nd = d + cost
+                if nxt not in closed and nd < dist.get(nxt, float('inf')) and h(nxt) < float('inf'):
+                    dist[nxt] = nd
+                    pred[nxt] = (node, shortcut)
+                    heapq.heappush(heap, (nd + h(nxt), nd, nxt))
+        self.last_settled = len(closed)
+        if target not in closed:
+            return None
+
+        rows = [target]
+        while pred[rows[-1]][0] != NO_PREDECESSOR:
+            row = rows[-1]
+            previous, shortcut = pred[row]
+            if shortcut:
+                _, local = self._portal_tree(previous, metric)
+                step = local[row]
+                while step != previous:
+                    rows.append(step)
+                    step = local[step]
+            rows.append(previous)
+        rows.reverse()
+        return rows
+
+
+class RoutePlanner:
+    """Shortest routes by travel time or fuel over a WorldStore's routes
+
+    Every query from a source is answered from that source's shortest-path
+    tree (distance and predecessor lists from one Dijkstra run). Trees are
+    cached in an LRU keyed by (source, metric), so repeated route queries are
+    lookups plus a walk back along the predecessors.
+
+    When routes open, close or change travel time, cached trees are repaired
+    from the world's change log rather than dropped: a cheaper edge relaxes
+    outwards from its head, and a dearer or closed tree edge re-settles only
+    the subtree that hung below it. `version` is the graph_version the cached
+    trees reflect; trees are only rebuilt from scratch if the change log no
+    longer reaches back that far.
+
+    Queries from a source without a cached tree go through a SystemRouter
+    instead, which crosses intermediate star systems by precomputed portal
+    shortcuts. Once a source has been asked TREE_AFTER_QUERIES times, its
+    tree is built and cached, so a player's current station soon answers
+    every route by lookup.
+
+    A full all-pairs table would cost O(locations^2) memory, which does not
+    fit a generated galaxy; for the hand-written map every source fits in the
+    cache and the planner behaves like one.
+    """
+
+    def __init__(self, world, fuel_cost: Callable[[float], int],
+                 fuel_units: Optional[Callable[[float], int]] = None, cache_size: int = ROUTE_CACHE_SIZE):
+        self.world = world
+        self.fuel_cost = fuel_cost
+        self.fuel_units = fuel_units
+        self.cache_size = cache_size
+        self._trees: 'OrderedDict[Tuple[int, str], Tuple[List[float], List[int]]]' = OrderedDict()
+        self._queries: 'OrderedDict[Tuple[int, str], int]' = OrderedDict()  # System-search queries per source
+        self.version = world.graph_version
+        self._weights = {'time': lambda t: t, 'fuel': lambda t: float(self.fuel_cost(t))}
+        self.systems = SystemRouter(world, self._weights)
+
+        # CSR snapshot for fuel-tank routes, rebuilt lazily after route changes
+        self._graph_version = None
+        self._graph: Tuple[List[int], List[int], List[float]] = ([0], [], [])
+        self._need: List[int] = []      # Fuel units each edge burns
+        self._units_per_ly = 0.0        # Least fuel burnt per light year closed, over all edges
+
+    def _sync(self):
+        """Bring cached trees up to the world's current routes"""
+        if self.version == self.world.graph_version:
+            return
+        changes = self.world.changes_since(self.version)
+        if changes is None:
+            self._trees.clear()
+        elif changes:
+            # Net effect per route: travel time before the first change vs. now
+            before: Dict[Tuple[int, int], Optional[float]] = {}
+            for change in changes:
+                before.setdefault((change.origin, change.destination), change.old_time)
+            for (source, metric), tree in self._trees.items():
+                self._repair(tree, metric, before)
+        self.version = self.world.graph_version
+
+    def _repair(self, tree: Tuple[List[float], List[int]], metric: str,
+                before: Dict[Tuple[int, int], Optional[float]]):
+        """Update one shortest-path tree for a batch of route changes"""
+        dist, pred = tree
+        weight = self._weights[metric]
+        adjacency = self.world.adjacency
+
+        # Closed or dearer tree edges: everything hanging below them loses its distance
+        affected = set()
+        for (u, v), old_time in before.items():
+            new_time = adjacency[u].get(v)
+            if pred[v] == u and (new_time is None or weight(new_time) > weight(old_time)):
+                affected.add(v)
+        stack = list(affected)
+        while stack:
+            node = stack.pop()
+            for child in adjacency[node]:
+                if pred[child] == node and child not in affected:
+                    affected.add(child)
+                    stack.append(child)
+        for node in affected:
+            dist[node] = float('inf')
+            pred[node] = NO_PREDECESSOR
+
+        # ...and is re-seeded from its best neighbour outside the damaged region
+        heap = []
+        for node in affected:
+            for parent, travel_time in self.world.incoming[node].items():
+                if parent not in affected:
+                    candidate = dist[parent] + weight(travel_time)
+                    if candidate < dist[node]:
+                        dist[node] = candidate
+                        pred[node] = parent
+            if dist[node] < float('inf'):
+                heap.append((dist[node], node))
+
+        # Opened or cheaper edges can only improve paths through their head
+        for (u, v), old_time in before.items():
+            new_time = adjacency[u].get(v)
+            if new_time is not None and (old_time is None or weight(new_time) < weight(old_time)):
+                candidate = dist[u] + weight(new_time)
+                if candidate < dist[v]:
+                    dist[v] = candidate
+                    pred[v] = u
+                    heap.append((candidate, v))
+
+        heapq.heapify(heap)
+        self._settle(dist, pred, heap, weight)
+
+    def _settle(self, dist: List[float], pred: List[int], heap: list, weight: Callable[[float], float]):
+        """Dijkstra from the labels on `heap`, improving dist/pred in place"""
+        adjacency = self.world.adjacency
+        while heap:
+            d, node = heapq.heappop(heap)
+            if d > dist[node]:
+                continue
+            for target, travel_time in adjacency[node].items():
+                nd = d + weight(travel_time)
+                if nd < dist[target]:
+                    dist[target] = nd
+                    pred[target] = node
+                    heapq.heappush(heap, (nd, target))
+
+    def _tree(self, source: int, metric: str) -> Tuple[List[float], List[int]]:
+        if metric not in METRICS:
+            raise ValueError(f"Unknown route metric '{metric}'")
+        self._sync()
+        key = (source, metric)
+        tree = self._trees.get(key)
+        if tree is None:
+            n = len(self.world.adjacency)
+            dist = [float('inf')] * n
+            pred = [NO_PREDECESSOR] * n
+            dist[source] = 0.0
+            self._settle(dist, pred, [(0.0, source)], self._weights[metric])
+            tree = self._trees[key] = (dist, pred)
+            if len(self._trees) > self.cache_size:
+                self._trees.popitem(last=False)
+        else:
+            self._trees.move_to_end(key)
+        return tree
+
+    def tree(self, origin: str, metric: str = 'time') -> Tuple[np.ndarray, np.ndarray]:
+        """(distance, predecessor) arrays of every location from `origin`, by row"""
+        dist, pred = self._tree(self.world.location_index[origin], metric)
+        return np.array(dist), np.array(pred, dtype=np.int32)
+
+    def route(self, origin: str, destination: str, metric: str = 'time') -> Optional[Route]:
+        """Best route from origin to destination, or None if it cannot be reached
+
+        Answered from the origin's cached tree if there is one, otherwise by
+        the system-level search, which touches far fewer stations than a
+        fresh tree would - until the origin has been asked often enough to
+        be worth a tree of its own.
+        """
+        if metric not in METRICS:
+            raise ValueError(f"Unknown route metric '{metric}'")
+        source = self.world.location_index[origin]
+        target = self.world.location_index[destination]
+        key = (source, metric)
+        if key in self._trees or self._worth_a_tree(key):
+            dist, pred = self._tree(source, metric)
+            if dist[target] == float('inf'):
+                return None
+            rows = [target]
+            while pred[rows[-1]] != NO_PREDECESSOR:
+                rows.append(pred[rows[-1]])
+            rows.reverse()
+        else:
+            rows = self.systems.path(source, target, metric)
+            if rows is None:
+                return None
+
+        adjacency = self.world.adjacency
+        legs = [adjacency[a][b] for a, b in zip(rows, rows[1:])]
+        return Route(
+            [self.world.location_ids[row] for row in rows], legs,
+            sum(legs), sum(self.fuel_cost(t) for t in legs)
+        )
+
+    def _worth_a_tree(self, key: Tuple[int, str]) -> bool:
+        """Count one system-search query from a source; True once it should get a cached tree"""
+        count = self._queries.pop(key, 0) + 1
+        if count >= TREE_AFTER_QUERIES:
+            return True
+        self._queries[key] = count
+        if len(self._queries) > self.cache_size:
+            self._queries.popitem(last=False)
+        return False
+
+    def reachable(self, origin: str, metric: str = 'time') -> Dict[str, float]:
+        """Every location reachable from origin (origin excluded) with its route cost"""
+        origin_row = self.world.location_index[origin]
+        dist, _ = self._tree(origin_row, metric)
+        ids = self.world.location_ids
+        return {ids[row]: d for row, d in enumerate(dist) if d < float('inf') and row != origin_row}
+
+    def _fuel_graph(self) -> Tuple[List[int], List[int], List[float]]:
+        """CSR routes plus per-edge fuel burn and the heuristic's units-per-light-year scale"""
+        if self._graph_version != self.world.graph_version:
+            indptr, dest, times = self.world.csr()
+            self._graph = (indptr.tolist(), dest.tolist(), times.tolist())
+            # Fuel each jump burns, and the least fuel any jump burns per light year it
+            # closes - which makes units_per_ly * straight-line distance a lower bound
+            self._need = [self.fuel_units(t) for t in self._graph[2]]
+            self._units_per_ly = 0.0
+            origin = np.repeat(np.arange(len(indptr) - 1), np.diff(indptr))
+            span = np.linalg.norm(self.world.positions[dest] - self.world.positions[origin], axis=1)
+            moving = span > 1e-9
+            if moving.any():
+                self._units_per_ly = float(np.min(np.asarray(self._need)[moving] / span[moving]))
+            self._graph_version = self.world.graph_version
+        return self._graph
+
+    def fuel_route(self, origin: str, destination: str, capacity: int, fuel: int,
+                   fuel_prices: Callable[[np.ndarray], np.ndarray],
+                   price_floor: float = 0.0) -> Optional[Route]:
+        """Cheapest route for a ship with a `capacity`-unit tank holding `fuel` units
+
+        Jumps that burn more than a full tank are impassable. Fuel can be bought
+        at any stop for that station's price: fuel_prices(rows) returns the
+        prices at an array of location rows, and is only asked about stations
+        within a tank of somewhere the search stops, each at most once. No
+        station sells fuel below price_floor. A* searches (station, fuel in tank) labels. At each stop the ship buys
+        nothing, fills up, or buys exactly enough to arrive empty at a cheaper
+        station (or the destination) within one tank - some optimal plan only
+        ever does one of these (the gas-station rule), so the labels per stop
+        grow with the cheaper stations in range, not with the tank size.
+        Labels beaten on both talents spent and fuel left are dropped (Pareto
+        pruning). The heuristic - fuel still needed to cover the straight-line
+        distance to the destination at price_floor - never overestimates, so
+        the first arrival is the cheapest.
+        """
+        if self.fuel_units is None:
+            raise ValueError("RoutePlanner was built without a fuel_units function")
+        indptr, dest, times = self._fuel_graph()
+        need = self._need
+        index = self.world.location_index
+        start, goal = index[origin], index[destination]
+        prices: Dict[int, float] = {}
+        positions = self.world.positions
+        gap = (np.linalg.norm(positions - positions[goal], axis=1) * self._units_per_ly).tolist()
+        fuel = min(fuel, capacity)
+
+        # Label = (row, tank, talents spent, parent label, edge taken, units bought before it)
+        labels: List[Tuple[int, int, float, int, int, int]] = [(start, fuel, 0.0, -1, -1, 0)]
+        frontier: Dict[int, List[Tuple[float, int]]] = {}
+        heap = [(max(0.0, gap[start] - fuel) * price_floor, 0.0, 0)]
+
+        def dominated(row: int, cost: float, tank: int) -> bool:
+            return any(c <= cost and t >= tank for c, t in frontier.get(row, ()))
+
+        # Per station: fuel needed to reach each cheaper station or the destination on one tank
+        targets: Dict[int, List[int]] = {}
+
+        def cheaper_in_range(row: int) -> List[int]:
+            found = targets.get(row)
+            if found is not None:
+                return found
+            units = {row: 0}
+            reach = [(0, row)]
+            while reach:
+                used, node = heapq.heappop(reach)
+                if used > units[node]:
+                    continue
+                for edge in range(indptr[node], indptr[node + 1]):
+                    total = used + need[edge]
+                    if total <= capacity and total < units.get(dest[edge], capacity + 1):
+                        units[dest[edge]] = total
+                        heapq.heappush(reach, (total, dest[edge]))
+
+            # One batched price lookup for the stations in range not priced yet
+            unpriced = np.fromiter((node for node in units if node not in prices), dtype=np.intp)
+            if unpriced.size:
+                prices.update(zip(unpriced.tolist(), np.asarray(fuel_prices(unpriced), dtype=np.float64).tolist()))
+            found = targets[row] = sorted({used for node, used in units.items()
+                                           if node != row and (node == goal or prices[node] < prices[row])})
+            return found
+
+        while heap:
+            _, cost, label = heapq.heappop(heap)
+            row, tank = labels[label][0], labels[label][1]
+            if row == goal:
+                return self._fuel_route_from(labels, label, prices)
+            if dominated(row, cost, tank):
+                continue
+            frontier.setdefault(row, []).append((cost, tank))
+
+            purchases = {0, capacity - tank}
+            purchases.update(units - tank for units in cheaper_in_range(row) if units > tank)
+            for edge in range(indptr[row], indptr[row + 1]):
+                burn = need[edge]
+                for bought in purchases:
+                    if tank + bought < burn:
+                        continue
+                    spent = cost + bought * prices[row]
+                    left = tank + bought - burn
+                    target = dest[edge]
+                    if dominated(target, spent, left):
+                        continue
+                    labels.append((target, left, spent, label, edge, bought))
+                    estimate = spent + max(0.0, gap[target] - left) * price_floor
+                    heapq.heappush(heap, (estimate, spent, len(labels) - 1))
+        return None
+
+    def _fuel_route_from(self, labels, label: int, prices: Dict[int, float]) -> Route:
+        ids = self.world.location_ids
+        _, dest, times = self._graph
+        final_tank, total = labels[label][1], labels[label][2]
+        rows, legs, refuels = [], [], []
+        while labels[label][3] != -1:
+            row, _, _, parent, edge, bought = labels[label]
+            parent_row = labels[parent][0]
+            rows.append(row)
+            legs.append(times[edge])
+            if bought:
+                refuels.append((ids[parent_row], bought, int(round(bought * prices[parent_row]))))
+            label = parent
+        rows.append(labels[label][0])
+        rows.reverse()
+        legs.reverse()
+        refuels.reverse()
+        return Route([ids[row] for row in rows], legs, sum(legs), int(round(total)),
+                     refuels, final_tank)
@@ -0,0 +1,146 @@
+"""
+TradeWinds Spatial Index
+Real 3D star positions and a KD-tree for nearest / in-range queries
+"""
+
+import heapq
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+import numpy as np
+
+# Sky position of each star system as (right ascension, declination) in degrees.
+# Distances come from each location's distance_from_earth (light years).
+SYSTEM_SKY_POSITIONS: Dict[str, Tuple[float, float]] = {
+    "Sol": (0.0, 0.0),
+    "Alpha Centauri": (217.429, -62.680),
+    "Sirius": (101.287, -16.716),
+    "Vega": (279.235, 38.784),
+    "Altair": (297.696, 8.868),
+    "Wolf 359": (164.120, 7.015),
+    "TRAPPIST-1": (346.622, -5.041),
+    "Kepler-452": (296.843, 44.277),
+    "Gliese 581": (229.862, -7.722),
+}
+
+# Points scanned directly instead of split further
+LEAF_SIZE = 16
+
+
+def equatorial_to_cartesian(ra, dec, distance) -> np.ndarray:
+    """Cartesian (x, y, z) light-year positions from RA/Dec in degrees and distance in light years"""
+    ra = np.radians(np.asarray(ra, dtype=np.float64))
+    dec = np.radians(np.asarray(dec, dtype=np.float64))
+    distance = np.asarray(distance, dtype=np.float64)
+    return np.stack([distance * np.cos(dec) * np.cos(ra),
+                     distance * np.cos(dec) * np.sin(ra),
+                     distance * np.sin(dec)], axis=-1)
+
+
+def system_position(system: str, distance_from_earth: float) -> np.ndarray:
+    """Position of a location in a known star system (unknown systems sit in the RA/Dec origin direction)
+
+    Names may carry a trailing " System" ("Sirius System" is "Sirius").
+    """
+    if system.endswith(" System"):
+        system = system[:-len(" System")]
+    ra, dec = SYSTEM_SKY_POSITIONS.get(system, (0.0, 0.0))
+    return equatorial_to_cartesian(ra, dec, distance_from_earth)
+
+
+class SpatialIndex:
+    """Static KD-tree over 3D points
+
+    Points are reordered so every subtree is a contiguous slice; the median
+    of each slice is its split point, and the split axis is stored at the
+    median's position. Small slices are scanned as one vectorized block.
+    Nearest-k and radius queries visit O(log n) slices on typical data.
+    """
+
+    def __init__(self, points, ids: Sequence[str], leaf_size: int = LEAF_SIZE):
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+        self.leaf_size = max(1, leaf_size)
+        order = np.arange(len(points))
+        self._axis = np.full(len(points), -1, dtype=np.int8)
+
+        stack = [(0, len(points))]
+        while stack:
+            lo, hi = stack.pop()
+            if hi - lo <= self.leaf_size:
+                continue
+            segment = order[lo:hi]
+            axis = int(np.argmax(np.ptp(points[segment], axis=0)))
+            mid = (lo + hi) // 2
+            order[lo:hi] = segment[np.argpartition(points[segment, axis], mid - lo)]
+            self._axis[mid] = axis
+            stack.append((lo, mid))
+            stack.append((mid + 1, hi))
+
+        self.points = points[order]
+        self.ids = [ids[i] for i in order]
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def nearest(self, point, k: int, exclude: Iterable[str] = ()) -> List[Tuple[str, float]]:
+        """The k closest points to `point` as (id, distance), closest first"""
+        point = np.asarray(point, dtype=np.float64)
+        exclude = set(exclude)
+        heap: List[Tuple[float, int]] = []  # (-squared distance, slot), worst on top
+        if k <= 0:
+            return []
+
+        def offer(slots: np.ndarray, d2: np.ndarray):
+            for slot, dist in zip(slots.tolist(), d2.tolist()):
+                if self.ids[slot] in exclude:
+                    continue
+                if len(heap) < k:
+                    heapq.heappush(heap, (-dist, slot))
+                elif dist < -heap[0][0]:
+                    heapq.heapreplace(heap, (-dist, slot))
+
+        def visit(lo: int, hi: int):
+            if hi - lo <= self.leaf_size:
+                if hi > lo:
+                    d2 = ((self.points[lo:hi] - point) ** 2).sum(axis=1)
+                    offer(np.arange(lo, hi), d2)
+                return
+            mid = (lo + hi) // 2
+            axis = self._axis[mid]
+            diff = point[axis] - self.points[mid, axis]
+            offer(np.array([mid]), ((self.points[mid:mid + 1] - point) ** 2).sum(axis=1))
+            near, far = ((mid + 1, hi), (lo, mid)) if diff > 0 else ((lo, mid), (mid + 1, hi))
+            visit(*near)
+            if len(heap) < k or diff * diff < -heap[0][0]:
+                visit(*far)
+
+        visit(0, len(self.ids))
+        return [(self.ids[slot], float(np.sqrt(-d))) for d, slot in sorted(heap, key=lambda entry: (-entry[0], entry[1]))]
+
+    def within(self, point, radius: float, exclude: Iterable[str] = ()) -> List[Tuple[str, float]]:
+        """Every point within `radius` of `point` as (id, distance), closest first"""
+        point = np.asarray(point, dtype=np.float64)
+        exclude = set(exclude)
+        r2 = radius * radius
+        found: List[Tuple[float, int]] = []
+
+        def collect(lo: int, hi: int):
+            d2 = ((self.points[lo:hi] - point) ** 2).sum(axis=1)
+            for offset in np.flatnonzero(d2 <= r2).tolist():
+                found.append((float(d2[offset]), lo + offset))
+
+        def visit(lo: int, hi: int):
+            if hi - lo <= self.leaf_size:
+                collect(lo, hi)
+                return
+            mid = (lo + hi) // 2
+            axis = self._axis[mid]
+            diff = point[axis] - self.points[mid, axis]
+            collect(mid, mid + 1)
+            if diff <= radius:
+                visit(lo, mid)
+            if diff >= -radius:
+                visit(mid + 1, hi)
+
+        visit(0, len(self.ids))
+        found.sort()
+        return [(self.ids[slot], float(np.sqrt(d2))) for d2, slot in found if self.ids[slot] not in exclude]
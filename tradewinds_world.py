@@ -0,0 +1,401 @@
+"""
+TradeWinds World Store
+Locations and commodities kept as parallel columns indexed by integer ids
+"""
+
+from collections import deque
+from collections.abc import Mapping
+from dataclasses import dataclass
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Callable, Deque, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from tradewinds_spatial import system_position
+
+# Rich text lives outside the columns and is only fetched when shown
+LOCATION_TEXT = ('short_desc', 'long_desc', 'atmosphere')
+COMMODITY_TEXT = ('description',)
+
+# Loaded descriptions kept in memory at once (per text store)
+TEXT_CACHE_SIZE = 256
+
+# Route changes remembered, so caches can repair themselves instead of rebuilding
+CHANGE_LOG_SIZE = 1024
+
+
+@dataclass
+class CommodityRecord:
+    """Hand-written commodity entry, turned into columns by WorldStore.from_records"""
+    name: str
+    base_price: int
+    volatility: float
+    description: str
+    elasticity: float = 0.005  # Log-price shift per unit traded
+
+
+@dataclass
+class LocationRecord:
+    """Hand-written location entry, turned into columns by WorldStore.from_records"""
+    id: str
+    name: str
+    system: str
+    short_desc: str
+    long_desc: str
+    atmosphere: str  # Atmospheric description
+    produces: List[str]
+    consumes: List[str]
+    distance_from_earth: float
+    connections: Dict[str, float]  # location_id -> travel_time
+
+
+@dataclass
+class RouteChange:
+    """One route edit; travel times are None where the route did not (or no longer) exist"""
+    version: int  # graph_version right after the change
+    origin: int
+    destination: int
+    old_time: Optional[float]
+    new_time: Optional[float]
+
+
+class TextStore:
+    """Rich text fields for the rows of a store, kept apart from the numeric columns
+
+    Text is either put in up front or fetched a row at a time from a loader
+    (e.g. a reader seeking to byte offsets in a file). Loaded rows go through
+    a small LRU cache, so only recently shown descriptions stay in memory.
+    """
+
+    def __init__(self, fields: Sequence[str], loader: Optional[Callable[[int], Dict[str, str]]] = None,
+                 cache_size: int = TEXT_CACHE_SIZE):
+        self.fields = tuple(fields)
+        self._field_index = {name: i for i, name in enumerate(self.fields)}
+        self._rows: Dict[int, Tuple[str, ...]] = {}
+        self._loader = loader
+        self._load = lru_cache(maxsize=cache_size)(self._read)
+
+    def put(self, row: int, values: Dict[str, str]):
+        self._rows[row] = tuple(values.get(name, "") for name in self.fields)
+
+    def _read(self, row: int) -> Tuple[str, ...]:
+        values = self._loader(row)
+        return tuple(values.get(name, "") for name in self.fields)
+
+    def get(self, row: int, name: str) -> str:
+        values = self._rows.get(row)
+        if values is None:
+            if self._loader is None:
+                return ""
+            values = self._load(row)
+        return values[self._field_index[name]]
+
+
+class Commodity:
+    """Thin accessor over one commodity row of a WorldStore"""
+
+    __slots__ = ('_world', 'row')
+
+    def __init__(self, world: 'WorldStore', row: int):
+        self._world = world
+        self.row = row
+
+    @property
+    def id(self) -> str:
+        return self._world.commodity_ids[self.row]
+
+    @property
+    def name(self) -> str:
+        return self._world.commodity_names[self.row]
+
+    @property
+    def base_price(self) -> int:
+        return int(self._world.base_prices[self.row])
+
+    @property
+    def volatility(self) -> float:
+        return float(self._world.volatility[self.row])
+
+    @property
+    def elasticity(self) -> float:
+        return float(self._world.elasticity[self.row])
+
+    @property
+    def description(self) -> str:
+        return self._world.commodity_text.get(self.row, 'description')
+
+    def __repr__(self) -> str:
+        return f"Commodity({self.id!r})"
+
+
+class Location:
+    """Thin accessor over one location row of a WorldStore
+
+    Reads the same attributes the old per-location dataclass carried, so
+    game code is unchanged; nothing is copied out of the columns.
+    """
+
+    __slots__ = ('_world', 'row')
+
+    def __init__(self, world: 'WorldStore', row: int):
+        self._world = world
+        self.row = row
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, Location) and other._world is self._world and other.row == self.row
+
+    def __hash__(self) -> int:
+        return hash((id(self._world), self.row))
+
+    @property
+    def id(self) -> str:
+        return self._world.location_ids[self.row]
+
+    @property
+    def name(self) -> str:
+        return self._world.location_names[self.row]
+
+    @property
+    def system(self) -> str:
+        return self._world.system_names[self._world.system_id[self.row]]
+
+    @property
+    def distance_from_earth(self) -> float:
+        return float(self._world.distance[self.row])
+
+    @property
+    def position(self) -> np.ndarray:
+        return self._world.positions[self.row]
+
+    @property
+    def short_desc(self) -> str:
+        return self._world.location_text.get(self.row, 'short_desc')
+
+    @property
+    def long_desc(self) -> str:
+        return self._world.location_text.get(self.row, 'long_desc')
+
+    @property
+    def atmosphere(self) -> str:
+        return self._world.location_text.get(self.row, 'atmosphere')
+
+    @property
+    def produces(self) -> List[str]:
+        return self._world.produced_at(self.row)
+
+    @property
+    def consumes(self) -> List[str]:
+        return self._world.consumed_at(self.row)
+
+    @property
+    def connections(self) -> Mapping:
+        """Read-only destination id -> travel time; edit routes with WorldStore.set_route / close_route"""
+        ids = self._world.location_ids
+        return MappingProxyType({ids[dest]: time for dest, time in self._world.adjacency[self.row].items()})
+
+    @property
+    def visited(self) -> bool:
+        return bool(self._world.visited[self.row])
+
+    @visited.setter
+    def visited(self, value: bool):
+        self._world.visited[self.row] = value
+
+    @property
+    def market_prices(self):
+        # Computed on first read for the current game day
+        return self._world.market.view(self.id)
+
+    def __repr__(self) -> str:
+        return f"Location({self.id!r})"
+
+
+class _Catalog(Mapping):
+    """id -> accessor mapping over one table of a WorldStore, in row order"""
+
+    def __init__(self, world: 'WorldStore', ids: List[str], index: Dict[str, int], view):
+        self._world = world
+        self._ids = ids
+        self._index = index
+        self._view = view
+
+    def __getitem__(self, key: str):
+        return self._view(self._world, self._index[key])
+
+    def __contains__(self, key) -> bool:
+        return key in self._index
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._ids)
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+
+class WorldStore:
+    """Every location and commodity of a galaxy in parallel columns
+
+    Rows are integer ids; string ids map to rows through one dict per table.
+    Produce/consume sets are bit-packed (one bit per commodity per location),
+    systems are interned, and rich text sits in separate TextStores that can
+    load on demand. Routes are adjacency lists of {row: travel_time} dicts
+    (outgoing and incoming). Every route edit bumps graph_version and is kept
+    in a short change log, so derived structures (the CSR arrays from csr(),
+    cached routes) can tell they are stale and repair only what changed.
+    """
+
+    def __init__(self, commodity_ids: Sequence[str], commodity_names: Sequence[str],
+                 base_prices, volatility, elasticity,
+                 location_ids: Sequence[str], location_names: Sequence[str],
+                 location_systems: Sequence[str], distance, produces, consumes,
+                 location_text: Optional[TextStore] = None, commodity_text: Optional[TextStore] = None,
+                 positions=None):
+        self.commodity_ids = list(commodity_ids)
+        self.commodity_index = {cid: i for i, cid in enumerate(self.commodity_ids)}
+        self.commodity_names = list(commodity_names)
+        self.base_prices = np.asarray(base_prices, dtype=np.int32)
+        self.volatility = np.asarray(volatility, dtype=np.float64)
+        self.elasticity = np.asarray(elasticity, dtype=np.float64)
+
+        self.location_ids = list(location_ids)
+        self.location_index = {lid: i for i, lid in enumerate(self.location_ids)}
+        self.location_names = list(location_names)
+        self.system_names, system_id = np.unique(np.asarray(location_systems, dtype=object), return_inverse=True)
+        self.system_names = list(self.system_names)
+        self.system_id = system_id.astype(np.int32)
+        self.distance = np.asarray(distance, dtype=np.float32)
+        if positions is None:
+            positions = np.zeros((len(self.location_ids), 3))
+        self.positions = np.asarray(positions, dtype=np.float64).reshape(-1, 3)  # Light-year x, y, z
+        self.visited = np.zeros(len(self.location_ids), dtype=bool)
+
+        self._produces = np.packbits(np.asarray(produces, dtype=bool), axis=1)
+        self._consumes = np.packbits(np.asarray(consumes, dtype=bool), axis=1)
+
+        self.location_text = location_text or TextStore(LOCATION_TEXT)
+        self.commodity_text = commodity_text or TextStore(COMMODITY_TEXT)
+
+        self.adjacency: List[Dict[int, float]] = [{} for _ in self.location_ids]
+        self.incoming: List[Dict[int, float]] = [{} for _ in self.location_ids]
+        self.graph_version = 0
+        self._changes: Deque[RouteChange] = deque(maxlen=CHANGE_LOG_SIZE)
+        self._csr = None
+        self._csr_version = -1
+
+        # Set by the game once a MarketEngine is built over this world
+        self.market = None
+
+        self.locations = _Catalog(self, self.location_ids, self.location_index, Location)
+        self.commodities = _Catalog(self, self.commodity_ids, self.commodity_index, Commodity)
+
+    @classmethod
+    def from_records(cls, commodities: Dict[str, CommodityRecord],
+                     locations: Iterable[LocationRecord]) -> 'WorldStore':
+        """Build a store from hand-written commodity and location records"""
+        locations = list(locations)
+        commodity_index = {cid: i for i, cid in enumerate(commodities)}
+        produces = np.zeros((len(locations), len(commodities)), dtype=bool)
+        consumes = np.zeros_like(produces)
+        for row, location in enumerate(locations):
+            produces[row, [commodity_index[cid] for cid in location.produces]] = True
+            consumes[row, [commodity_index[cid] for cid in location.consumes]] = True
+
+        world = cls(
+            commodities, [c.name for c in commodities.values()],
+            [c.base_price for c in commodities.values()],
+            [c.volatility for c in commodities.values()],
+            [c.elasticity for c in commodities.values()],
+            [loc.id for loc in locations], [loc.name for loc in locations],
+            [loc.system for loc in locations], [loc.distance_from_earth for loc in locations],
+            produces, consumes,
+            positions=[system_position(loc.system, loc.distance_from_earth) for loc in locations]
+        )
+        for row, commodity in enumerate(commodities.values()):
+            world.commodity_text.put(row, {'description': commodity.description})
+        for row, location in enumerate(locations):
+            world.location_text.put(row, {name: getattr(location, name) for name in LOCATION_TEXT})
+        world.add_routes(
+            (location.id, dest_id, travel_time)
+            for location in locations
+            for dest_id, travel_time in location.connections.items()
+        )
+        return world
+
+    def _unpack(self, bits: np.ndarray) -> np.ndarray:
+        return np.unpackbits(bits, axis=-1, count=len(self.commodity_ids)).astype(bool)
+
+    def produce_mask(self) -> np.ndarray:
+        """Full locations x commodities boolean matrix of what each location produces"""
+        return self._unpack(self._produces)
+
+    def consume_mask(self) -> np.ndarray:
+        """Full locations x commodities boolean matrix of what each location consumes"""
+        return self._unpack(self._consumes)
+
+    def produced_at(self, row: int) -> List[str]:
+        return [self.commodity_ids[c] for c in np.flatnonzero(self._unpack(self._produces[row]))]
+
+    def consumed_at(self, row: int) -> List[str]:
+        return [self.commodity_ids[c] for c in np.flatnonzero(self._unpack(self._consumes[row]))]
+
+    def add_routes(self, routes: Iterable[Tuple[str, str, float]]):
+        """Add or update one-way (origin, destination, travel_time) routes"""
+        for origin, dest, travel_time in routes:
+            self.set_route(origin, dest, travel_time)
+
+    def set_route(self, origin: str, dest: str, travel_time: float):
+        """Open a one-way route, or change its travel time"""
+        a, b = self.location_index[origin], self.location_index[dest]
+        old_time = self.adjacency[a].get(b)
+        if old_time == travel_time:
+            return
+        self.adjacency[a][b] = travel_time
+        self.incoming[b][a] = travel_time
+        self._log(a, b, old_time, travel_time)
+
+    def close_route(self, origin: str, dest: str):
+        """Remove a one-way route (no-op if it is already closed)"""
+        a, b = self.location_index[origin], self.location_index[dest]
+        old_time = self.adjacency[a].pop(b, None)
+        if old_time is None:
+            return
+        del self.incoming[b][a]
+        self._log(a, b, old_time, None)
+
+    def _log(self, origin: int, dest: int, old_time: Optional[float], new_time: Optional[float]):
+        self.graph_version += 1
+        self._changes.append(RouteChange(self.graph_version, origin, dest, old_time, new_time))
+
+    def changes_since(self, version: int) -> Optional[List[RouteChange]]:
+        """Route changes made after `version`, oldest first; None if the log no longer reaches back that far"""
+        if version == self.graph_version:
+            return []
+        if not self._changes or self._changes[0].version > version + 1:
+            return None
+        return [change for change in self._changes if change.version > version]
+
+    def edges(self) -> Iterator[Tuple[str, str, float]]:
+        """Every route as (origin_id, destination_id, travel_time)"""
+        ids = self.location_ids
+        for row, neighbours in enumerate(self.adjacency):
+            for dest, travel_time in neighbours.items():
+                yield ids[row], ids[dest], travel_time
+
+    def csr(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Routes as compressed sparse rows (indptr, destinations, travel_times), rebuilt after changes"""
+        if self._csr_version != self.graph_version:
+            counts = np.fromiter((len(n) for n in self.adjacency), dtype=np.int64, count=len(self.adjacency))
+            indptr = np.concatenate(([0], np.cumsum(counts)))
+            dest = np.fromiter((d for n in self.adjacency for d in n), dtype=np.int64, count=indptr[-1])
+            times = np.fromiter((t for n in self.adjacency for t in n.values()), dtype=np.float64, count=indptr[-1])
+            self._csr = (indptr, dest, times)
+            self._csr_version = self.graph_version
+        return self._csr
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the numeric columns (ids, names and text not included)"""
+        return sum(a.nbytes for a in (self.base_prices, self.volatility, self.elasticity, self.system_id,
+                                      self.distance, self.positions, self.visited,
+                                      self._produces, self._consumes))